@@ -1,30 +1,45 @@
-import io
 import logging
 import os
 import threading
 import time
-from PIL import Image
+from concurrent.futures import Future, ThreadPoolExecutor
 from plugins import IPlugin
+from render.compositor import Compositor, FrameSource
+from render.frame_cache import FrameCache
+from render.icon_bundle import IconBundle, encode_icon
+from render.image_store import ImageStore
+from render.key_writer import KeyWriter
 from scrollers import IScroller
+from services.dial_aggregator import DialAggregator
+from services.idle import IdlePolicy, IdleTier
+from services.periodic import TaskPool
+from services.scheduler import Job, Scheduler
+from services.startup_profile import StartupProfiler, startup_profiler
+from services.timers import TimerHandle, TimerService
 from StreamDeck.Devices.StreamDeck import StreamDeck, DialEventType
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class App():
 
-    LOOP_COUNTER_MAX: int = 15
+    SCROLL_INTERVAL : float = 15.0
+    DIM_INTERVAL : float = 300.0
+    IDLE_CHECK_INTERVAL : float = 15.0
     LONG_PRESS_TIME : float = 0.3
+    WARM_UP_WORKERS : int = 4
+    ACTIVATE_WORKERS : int = 2
+    # startup is over once both of these have been recorded
+    FIRST_FRAME_MARKS : list[str] = [ "first_keys", "first_touchscreen_frame" ]
 
     def __init__(self, deck: Optional[StreamDeck], config: dict) -> None:
         self._plugins: List[IPlugin.IPlugin] = None
         self._active_plugin: Optional[IPlugin.IPlugin] = None
         self._scrollers: List[IScroller.IScroller] = None
         self._home_image: Optional[bytes] = None
-        self._render_lock: threading.Lock = threading.Lock()
         self._destroyed : bool = False
         self._active_scroller: int = 0
-        self._dim_counter: int = 0
-        self._loop_counter: int = 0
-        self._idle_counter : int = 0
+        # set by dial 2, the scroll job generates the newly chosen scroller's pages
+        self._scroller_changed : bool = False
+        self._idle_since: float = 0.0
         self._brightness: int = 100
         self._button_mask: int = 0
         self._deck: Optional[StreamDeck] = deck
@@ -36,8 +51,51 @@ class App():
         self._page_counter : int = 0
         self._num_pages : int = 0
         self._help_held : bool = False
-        self._help_timer: Optional[threading.Timer] = None
+        self._help_timer: Optional[TimerHandle] = None
         self._deck_lock: threading.Lock = threading.Lock()
+        # plugins activate in the background, so a slow connect doesn't freeze the deck
+        self._activator: ThreadPoolExecutor = ThreadPoolExecutor(max_workers = App.ACTIVATE_WORKERS, thread_name_prefix = "activate")
+        self._activations: dict[IPlugin.IPlugin, Future] = {}
+        # pressed again after backing out of a still running activation, its screen needs painting again
+        self._repressed: set[IPlugin.IPlugin] = set()
+        self._activation_lock: threading.Lock = threading.Lock()
+        self._activating_for: threading.local = threading.local()
+
+        frame_cache_config : dict = self._config.get("frame_cache", {})
+        self._frame_cache: FrameCache = FrameCache(frame_cache_config.get("max_bytes", FrameCache.DEFAULT_MAX_BYTES))
+        self._compositor: Compositor = Compositor(self, self._deck_lock)
+        # scrolling, dimming and idle deactivation run as jobs with exact deadlines
+        self._scheduler: Scheduler = Scheduler("main-loop")
+        # one thread for all the short lived notification and long press timers
+        self._timers: TimerService = TimerService()
+        # the plugins' polling, on a few shared threads
+        task_pool_config : dict = self._config.get("task_pool", {})
+        self._tasks: TaskPool = TaskPool(task_pool_config.get("max_workers", TaskPool.DEFAULT_MAX_WORKERS))
+        # a plugin's dial turns, summed and handed over once a frame
+        dials_config : dict = self._config.get("dials", {})
+        self._dials: DialAggregator = DialAggregator(
+            self._timers,
+            dials_config.get("frame_ms", DialAggregator.DEFAULT_FRAME_INTERVAL * 1000) / 1000,
+            dials_config.get("acceleration_threshold", DialAggregator.DEFAULT_THRESHOLD),
+            dials_config.get("max_multiplier", DialAggregator.DEFAULT_MAX_MULTIPLIER)
+        )
+        self._scroll_job: Job = None
+        # how far to throttle scrolling and polling after a while without input
+        self._idle_policy: IdlePolicy = IdlePolicy(self._config.get("idle_tiers", {}))
+        self._idle_tier: IdleTier = IdleTier.ACTIVE
+        self._last_input: float = time.monotonic()
+        self._idle_tier_job: Job = None
+        self._dim_job: Job = None
+        self._idle_job: Job = None
+        icon_bundle_config : dict = self._config.get("icon_bundle", {})
+        self._icon_bundle: IconBundle = IconBundle(icon_bundle_config.get("path", IconBundle.DEFAULT_PATH))
+        self._image_store: ImageStore = ImageStore()
+        key_writer_config : dict = self._config.get("key_writer", {})
+        self._key_writer: KeyWriter = KeyWriter(
+            self,
+            self._deck_lock,
+            key_writer_config.get("frame_window_ms", KeyWriter.DEFAULT_FRAME_WINDOW * 1000) / 1000
+        )
 
     @property
     def num_buttons(self) -> int:
@@ -57,6 +115,19 @@ class App():
             return self._deck.TOUCHSCREEN_PIXEL_HEIGHT
         return 0
 
+    @property
+    def num_dials(self) -> int:
+        if not self._deck_available():
+            return 4
+        return self._deck.DIAL_COUNT
+
+    def dial_zone(self, dial : int) -> Tuple[int, int, int, int]:
+        """
+        The x, y, width and height of the strip of touchscreen above a dial.
+        """
+        width : int = self.screen_width // self.num_dials
+        return (dial * width, 0, width, self.screen_height)
+
     @property
     def deck(self) -> Optional[StreamDeck]:
         if self._destroyed:
@@ -65,10 +136,82 @@ class App():
             return self._deck
         return None
 
+    @property
+    def idle_tier(self) -> IdleTier:
+        return self._idle_tier
+
+    @property
+    def active_plugin(self) -> Optional[IPlugin.IPlugin]:
+        return self._active_plugin
+
     @property
     def home_image(self) -> Optional[bytes]:
         return self._home_image
 
+    @property
+    def frame_cache(self) -> FrameCache:
+        return self._frame_cache
+
+    @property
+    def image_store(self) -> ImageStore:
+        return self._image_store
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self._scheduler
+
+    @property
+    def timers(self) -> TimerService:
+        return self._timers
+
+    @property
+    def tasks(self) -> TaskPool:
+        return self._tasks
+
+    @property
+    def dials(self) -> DialAggregator:
+        return self._dials
+
+    @property
+    def compositor(self) -> Compositor:
+        return self._compositor
+
+    @property
+    def key_writer(self) -> KeyWriter:
+        return self._key_writer
+
+    @property
+    def key_writes(self) -> int:
+        return self._key_writer.writes
+
+    @property
+    def key_writes_saved(self) -> int:
+        return self._key_writer.writes_saved
+
+    @property
+    def stats(self) -> dict:
+        """
+        Diagnostics from the app wide services.
+        """
+        return {
+            "idle_tier": self._idle_tier.name,
+            "scheduler": self._scheduler.stats,
+            "timers": self._timers.stats,
+            "tasks": self._tasks.stats,
+            "dials": self._dials.stats,
+            "compositor": self._compositor.stats,
+            "key_writer": self._key_writer.stats,
+            "frame_cache": self._frame_cache.stats,
+            "image_store": self._image_store.stats,
+            "warm_up": { p.name: p.warm_up_stats for p in self._plugins or [] if p.warm_up_stats is not None },
+            "input": { p.name: p.input_queue.stats for p in self._plugins or [] if p.input_queue.stats["handled"] > 0 },
+            "prefetch": { p.name: p.prefetch_stats for p in self._plugins or [] if hasattr(p, "prefetch_stats") },
+            "imports": {
+                "plugins": IPlugin.PluginFactory.registry.stats,
+                "scrollers": IScroller.ScrollerFactory.registry.stats
+            }
+        }
+
     @property
     def is_debug_enabled(self) -> bool:
         return self._config.get("debug", False)
@@ -78,45 +221,65 @@ class App():
         return self._config.get("creds_path", ".creds")
 
     def set_button_image(self, index: int = 0, image: Optional[bytes] = None) -> None:
+        self.set_button_images({index: image})
+
+    def set_button_images(self, images: dict[int, Optional[bytes]]) -> None:
+        """
+        Queues a full or partial layout of key to image, written by the key writer in one burst.
+        """
+        # an activation the user has already backed out of mustn't paint over the home page
+        plugin : Optional[IPlugin.IPlugin] = getattr(self._activating_for, "plugin", None)
+        if plugin is not None and plugin is not self._active_plugin:
+            return
         if self._destroyed or not self._deck_available():
             return
-        try:
-            with self._deck_lock:
-                self._deck.set_key_image(index, image)
-        except:
-            pass
+        self._key_writer.submit(images)
 
     def load_image(self, path: str, size: int = 100) -> bytes:
+        """
+        Serves the icon from the pre-encoded bundle, or encodes it live when it is missing or stale.
+        Identical files share one image through the image store.
+        """
         try:
-            img = Image.new('RGB', (120, 120), color='black')
-            icon = Image.open(path).resize((size, size)).convert("RGBA")
-            border = int((120 - size) / 2)
-            img.paste(icon, (border, border), icon)
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format = 'JPEG')
-            return img_byte_arr.getvalue()
+            return self._image_store.get(path, size, lambda: self._encode_image(path, size))
         except Exception as ex: 
             self._log.error(f"Failed to load image '{path}' : {ex}")
             return None
 
+    def _encode_image(self, path: str, size: int) -> bytes:
+        image = self._icon_bundle.get(path, size)
+        if image is not None:
+            return image
+        return encode_icon(path, size)
+
     def run(self) -> None:
+        profiler : StartupProfiler = startup_profiler()
         if not self._deck_available():
             self._log.error("No deck found")
             if not self.is_debug_enabled:
                 return
         else:
-            self._deck.open()
-            self._deck.reset()
+            with profiler.phase("deck.open"):
+                self._deck.open()
+            with profiler.phase("deck.reset"):
+                self._deck.reset()
+            self._key_writer.reset()
             self._log.info(f"Opened '{self._deck.deck_type()}' device (serial number: '{self._deck.get_serial_number()}')")
 
 
+        with profiler.phase("icons.bundle"):
+            self._icon_bundle.open()
+        self._timers.start()
+        self._tasks.start()
         font : dict = self._config["font"]
+        self._frame_cache.set_font(font)
         if self._plugins is None:
             plugins : list[IPlugin.IPlugin] = []
             self._log.debug("Loading plugins...")
             for plug in self._config["plugins"]:
-                plugin = IPlugin.PluginFactory.create_plugin(self, plug, font)
-                plugin.run_as_daemon()
+                with profiler.phase(f"plugin.{plug['name']}"):
+                    plugin = IPlugin.PluginFactory.create_plugin(self, plug, font)
+                    plugin.run_as_daemon()
                 plugins.append(plugin)
             self._plugins = plugins
             num_plugins = len(self._plugins)
@@ -138,15 +301,22 @@ class App():
             scrollers : list[IScroller.IScroller] = []
             self._log.debug("Loading scrollers...")
             for scroller in self._config["scrollers"]:
-                scroller = IScroller.ScrollerFactory.create_scroller(self, scroller, font)
+                with profiler.phase(f"scroller.{scroller['name']}"):
+                    scroller = IScroller.ScrollerFactory.create_scroller(self, scroller, font)
                 scrollers.append(scroller)
             self._scrollers = scrollers
             self._log.info(f"Loaded {len(self._scrollers)} scrollers")
 
+        IPlugin.PluginFactory.registry.report()
+        IScroller.ScrollerFactory.registry.report()
+
         if self._home_image is None:
             self._log.debug("Loading home images...")
-            self._home_image = self.load_image("images/home.png")
-            self._next_page_image = self.load_image("images/next.png")
+            with profiler.phase("icons.home"):
+                self._home_image = self.load_image("images/home.png")
+                self._next_page_image = self.load_image("images/next.png")
+            self._log.debug(f"Icon bundle : {self._icon_bundle.stats}")
+            self._log.debug(f"Image store : {self._image_store.stats}")
 
         # bind handlers
         if self._deck_available():
@@ -155,25 +325,48 @@ class App():
             self._deck.set_dial_callback(self._dial_change_callback)
             self._deck.set_brightness(self._brightness)
 
-        self._default_layout()
+        self._compositor.start()
+        self._key_writer.start()
+        with profiler.phase("layout"):
+            self._default_layout()
 
-        self._log.debug("Starting main thread loop...")
-        threading.Thread(target=self._main_loop, daemon=False).start()
+        warm_up_config : dict = self._config.get("warm_up", {})
+        if warm_up_config.get("enabled", False):
+            self._start_warm_up(warm_up_config.get("max_workers", App.WARM_UP_WORKERS))
 
-    def _render_scroller_image(self, b: bytes) -> None:
+        self._log.debug("Starting main thread loop...")
+        self._start_main_loop()
+
+    def _start_warm_up(self, max_workers : int) -> None:
+        """
+        Makes the plugins' connections in parallel in the background, so their first activation doesn't have to.
+        A plugin's config can opt out with "warm_up": false.
+        """
+        plugins : list[IPlugin.IPlugin] = [
+            plugin for plugin, plug in zip(self._plugins, self._config["plugins"])
+            if plugin.can_warm_up and plug.get("warm_up", True)
+        ]
+        if len(plugins) == 0:
+            return
+        self._log.info(f"Warming up {len(plugins)} plugins")
+        executor : ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers = max(1, min(max_workers, len(plugins))),
+            thread_name_prefix = "warm-up"
+        )
+        for plugin in plugins:
+            plugin.start_warm_up(executor)
+        # the threads exit once the last warm up is done
+        executor.shutdown(wait = False)
+
+    def _render_scroller_image(self, b: FrameSource) -> None:
         if self._destroyed or self._deck is None:
             return
         if self._active_plugin is not None:
             return
-        if not self._render_lock.acquire(blocking=False):
-            return
-        try:
-            with self._deck_lock:
-                self._deck.set_touchscreen_image(b, 0, 0, self.screen_width, self.screen_height)
-        except Exception as ex:
-            self._log.error(ex)
-        finally:
-            self._render_lock.release()
+        self._compositor.submit(b, guard = self._showing_scrollers)
+
+    def _showing_scrollers(self) -> bool:
+        return not self._destroyed and self._active_plugin is None
 
     def destroy(self) -> bool:
         self._destroyed = True
@@ -197,6 +390,12 @@ class App():
             for scroller in self._scrollers:
                 scroller.deactivate()
             self._scrollers.clear()
+            self._scheduler.stop()
+            self._timers.stop()
+            self._tasks.stop()
+            self._activator.shutdown(wait = False, cancel_futures = True)
+            self._compositor.stop()
+            self._key_writer.stop()
             
             success = True
         except Exception as ex:
@@ -206,7 +405,7 @@ class App():
 
     def _default_layout(self):
         self._log.debug("Creating default layout")
-        self.set_button_image(0, self._home_image)
+        layout : dict[int, Optional[bytes]] = { 0: self._home_image }
 
         num_plugins: int = len(self._plugins)
         start: int = self._page_counter * (self.num_buttons - 2)
@@ -216,34 +415,46 @@ class App():
             for p in range(start, num_plugins):
                 if None == self._plugins[p]:
                     continue
-                self.set_button_image(p + 1 - start, self._plugins[p].logo)
+                layout[p + 1 - start] = self._plugins[p].logo
 
             # blank the rest
             for p in range(num_plugins - start + 1, self.num_buttons):
-                self.set_button_image(p, None)
+                layout[p] = None
         else:
             for p in range(start, start + self.num_buttons - 2):
                 if p >= num_plugins: break
                 #if None == self._plugins[p]:
                 #    continue
-                self.set_button_image(p + 1 - start, self._plugins[p].logo)
+                layout[p + 1 - start] = self._plugins[p].logo
 
             # add a next
-            self.set_button_image(self.num_buttons - 1, self._next_page_image)
-        self._log.debug("Default layout created")
+            layout[self.num_buttons - 1] = self._next_page_image
+        self.set_button_images(layout)
+        self._log.debug(f"Default layout queued ({self.key_writes} key writes, {self.key_writes_saved} saved so far)")
 
     def _scroll(self):
         if not self._active_plugin:
             if len(self._scrollers) > 0:
                 
+                if self._scroller_changed:
+                    self._scroller_changed = False
+                    self._render_scroller_image(self._scrollers[self._active_scroller].generate())
+                    return
                 scroller = self._scrollers[self._active_scroller]
                 if scroller.has_next:
                     self._render_scroller_image(scroller.next())
                 else:
+                    pause_network : bool = self._idle_policy.pauses_network(self._idle_tier)
+                    for _ in range(len(self._scrollers)):
+                        self._active_scroller += 1
+                        if self._active_scroller >= len(self._scrollers):
+                            self._active_scroller = 0
+                        if not (pause_network and self._scrollers[self._active_scroller].uses_network):
+                            break
+                    else:
+                        # all of them are paused, leave the last page up
+                        return
                     self._log.debug(f"Setting up scroller : {self._active_scroller + 1}")
-                    self._active_scroller += 1
-                    if self._active_scroller >= len(self._scrollers):
-                        self._active_scroller = 0
                     self._render_scroller_image(self._scrollers[self._active_scroller].generate())
 
     def _dim(self, brightness_min : int):
@@ -258,18 +469,9 @@ class App():
             except:
                 pass
 
-    def _main_loop(self):
-        self._log.info("Main thread loop starting")
-
-        idle_time_minutes : int = self._config.get("idle_time_minutes", 15)
-        idle_step_time : int = (idle_time_minutes * 60) / App.LOOP_COUNTER_MAX
+    def _start_main_loop(self):
         brightness_dict : dict = self._config.get("brightness", {"minimum": 10})
         brightness_min : int = brightness_dict.get("minimum", 10)
-        dim_step_time : int = 300 / App.LOOP_COUNTER_MAX
-
-        self._loop_counter = App.LOOP_COUNTER_MAX
-        self._idle_counter = 0
-        self._dim_counter = 0
 
         if self._deck_available():
             brightness_initial : int = brightness_dict.get("initial", brightness_min)
@@ -280,36 +482,104 @@ class App():
             except:
                 pass
 
-        while not self._destroyed:
-            try:
-                self._loop_counter += 1
-   
-                if self._loop_counter >= App.LOOP_COUNTER_MAX:
-                    # 15 secs
-                    self._loop_counter = 0
-                    self._scroll()
-                    self._dim_counter += 1
-                    
-                    if self._dim_counter >= dim_step_time:
-                        # 5 mins
-                        self._dim_counter = 0
-                        self._dim(brightness_min)
-                    
-                    if self._active_plugin is not None:
-                        if self._active_plugin.idle:
-                            self._idle_counter += 1
-                            if self._idle_counter >= idle_step_time:
-                                self._log.debug("Deactivating plugin because of idle timeout")
-                                self._deactivate_plugin()
-                        else:
-                            self._idle_counter = 0
+        self._scroll_job = self._scheduler.schedule(self._on_scroll, 0, "scroll")
+        self._dim_job = self._scheduler.schedule(lambda: self._on_dim(brightness_min), App.DIM_INTERVAL, "dim")
+        self._idle_job = Job(self._scheduler, self._on_idle_check, "idle")
+        self._idle_tier_job = Job(self._scheduler, self._on_idle_tier_check, "idle-tier")
+        self._schedule_idle_tier_check()
+        # not a daemon, it keeps the process alive until destroy
+        self._scheduler.start()
 
-            except Exception as ex:
-                self._log.critical(ex)
-                pass
-            time.sleep(1.0)
+    def _on_scroll(self):
+        if self._destroyed:
+            return
+        try:
+            self._scroll()
+        except Exception as ex:
+            # one bad scroller mustn't stop the rest
+            self._log.error(f"Error scrolling : {ex}")
+        # nothing to scroll under a plugin, _deactivate_plugin brings us back
+        if self._active_plugin is None:
+            self._scroll_job.reschedule(App.SCROLL_INTERVAL * self._idle_policy.scroll_stretch(self._idle_tier))
+
+    def _scroll_now(self):
+        if self._scroll_job is not None:
+            self._scroll_job.reschedule(0)
+
+    def _on_dim(self, brightness_min : int):
+        self._dim(brightness_min)
+        self._log.debug(f"Stats : {self.stats}")
+        self._dim_job.reschedule(App.DIM_INTERVAL)
+
+    def _reset_dim(self):
+        if self._dim_job is not None:
+            self._dim_job.reschedule(App.DIM_INTERVAL)
+
+    def _on_input(self):
+        """
+        Any key or dial event, restarts the dimming and brings everything back to full speed.
+        """
+        self._reset_dim()
+        self._last_input = time.monotonic()
+        if self._idle_tier != IdleTier.ACTIVE:
+            self._set_idle_tier(IdleTier.ACTIVE)
+        self._schedule_idle_tier_check()
+
+    def _schedule_idle_tier_check(self):
+        if self._idle_tier_job is None:
+            return
+        delay : Optional[float] = self._idle_policy.next_change(time.monotonic() - self._last_input)
+        if delay is None:
+            self._idle_tier_job.cancel()
+        else:
+            self._idle_tier_job.reschedule(delay)
 
-        self._log.info("Main thread loop exiting")
+    def _on_idle_tier_check(self):
+        if self._destroyed:
+            return
+        tier : IdleTier = self._idle_policy.tier_for(time.monotonic() - self._last_input)
+        if tier != self._idle_tier:
+            self._set_idle_tier(tier)
+        self._schedule_idle_tier_check()
+
+    def _set_idle_tier(self, tier : IdleTier):
+        self._log.info(f"Idle tier {self._idle_tier.name} -> {tier.name}")
+        waking : bool = tier < self._idle_tier
+        self._idle_tier = tier
+        self._apply_poll_stretch()
+        if waking:
+            # whatever is up may be a long way out of date
+            self._scroll_now()
+
+    def _apply_poll_stretch(self):
+        """
+        Polls only slow down with nothing on screen but the home page, a plugin showing keeps its pace.
+        """
+        stretch : float = 1.0
+        if self._active_plugin is None:
+            stretch = self._idle_policy.poll_stretch(self._idle_tier)
+        self._tasks.set_stretch(stretch)
+
+    def _watch_idle(self):
+        self._idle_since = time.monotonic()
+        if self._idle_job is not None:
+            self._idle_job.reschedule(App.IDLE_CHECK_INTERVAL)
+
+    def _on_idle_check(self):
+        """
+        Plugins only report idle when asked, so this is checked every IDLE_CHECK_INTERVAL while one is active.
+        """
+        plugin : Optional[IPlugin.IPlugin] = self._active_plugin
+        if self._destroyed or plugin is None:
+            return
+        now : float = time.monotonic()
+        if not plugin.idle:
+            self._idle_since = now
+        elif now - self._idle_since >= self._config.get("idle_time_minutes", 15) * 60:
+            self._log.debug("Deactivating plugin because of idle timeout")
+            self._deactivate_plugin()
+            return
+        self._idle_job.reschedule(App.IDLE_CHECK_INTERVAL)
 
     def _dial_change_callback(self, deck, dial, event, value):
         if self._destroyed:
@@ -338,7 +608,9 @@ class App():
                                 self._active_scroller = 0
                             elif self._active_scroller < 0:
                                 self._active_scroller = len(self._scrollers) - 1
-                            self._render_scroller_image(self._scrollers[self._active_scroller].generate())
+                            # generated on the scheduler thread, alongside the scroller's paging, never on the compositor's
+                            self._scroller_changed = True
+                            self._scroll_now()
                         case 3:
                             self._brightness += value * 2
                             self._brightness = max(min(100, self._brightness), 10)
@@ -369,17 +641,18 @@ class App():
                                 except:
                                     pass
                             return
-            else:
+            elif not self._is_activating(self._active_plugin):
+                plugin : IPlugin.IPlugin = self._active_plugin
                 if event == DialEventType.PUSH:
-                    self._active_plugin.on_dial_pushed(deck, dial, value)
+                    plugin.input_queue.submit(plugin.on_dial_pushed, deck, dial, value)
                 elif event == DialEventType.TURN:
-                    self._active_plugin.on_dial_turned(deck, dial, value)
+                    self._dials.turn(plugin, deck, dial, value)
         except Exception as ex:
             self._log.error(ex)
 
         if self._destroyed:
             return
-        self._dim_counter = 0
+        self._on_input()
         self._brightness = 100
         try:
             with self._deck_lock:
@@ -388,8 +661,9 @@ class App():
             pass
 
     def _show_help(self) -> None:
-        if self._active_plugin and self._help_held:
-            self._active_plugin.show_help()
+        plugin : Optional[IPlugin.IPlugin] = self._active_plugin
+        if plugin and self._help_held:
+            plugin.input_queue.submit(plugin.show_help)
 
     def _key_change_callback(self, deck, key, key_state):
         if self._destroyed:
@@ -398,7 +672,7 @@ class App():
             self._log.debug("Key: " + str(key) + " state: " + str(key_state))
 
             brightness : int = self._brightness
-            self._dim_counter = 0
+            self._on_input()
             self._brightness = 100
             try:
                 with self._deck_lock:
@@ -416,7 +690,7 @@ class App():
                     return
                 # home key
                 if key == 0:
-                    self._loop_counter = App.LOOP_COUNTER_MAX
+                    self._scroll_now()
                     self._page_counter = 0
                     return
                 # next page key
@@ -434,10 +708,12 @@ class App():
                     plugin = self._plugins[key]
                     if plugin:
                         self._log.debug(f"Found plugin : {plugin.name}")
-                        # set this before we try and activate it so it blocks scroller images
-                        self._active_plugin = plugin
-                        if not plugin.activate():
-                            self._deactivate_plugin()
+                        self._start_activation(plugin)
+
+            elif self._is_activating(self._active_plugin):
+                # nothing to pass keys on to yet, back gives up on it
+                if 0 == key and key_state:
+                    self._cancel_activation()
 
             else:
                 # we have an active plugin
@@ -448,33 +724,115 @@ class App():
                         if key_state:
                             # start a help thread
                             self._help_held = True
-                            self._help_timer = threading.Timer(App.LONG_PRESS_TIME, self._show_help)
-                            self._help_timer.start()
+                            self._help_timer = self._timers.call_later(App.LONG_PRESS_TIME, self._show_help)
                         else:
                             self._help_held = False
                             if self._help_timer:
                                 self._help_timer.cancel()
                                 self._help_timer = None
-                            if self._active_plugin.help_showing:
-                                self._active_plugin.hide_help()
-                            else:
-                                if not self._active_plugin.handle_back_button():
-                                    self._deactivate_plugin()
+                            # behind any presses the plugin is still working through
+                            self._active_plugin.input_queue.submit(self._on_back, self._active_plugin)
                 else:
-                    # pass it through for the plugin to handle
-                    self._active_plugin.on_button_press(deck, key, key_state)
+                    # pass it through for the plugin to handle, off the reader thread
+                    self._active_plugin.input_queue.submit(self._active_plugin.on_button_press, deck, key, key_state)
 
         except Exception as ex:
             self._log.exception('Error in _key_change_callback')
 
+    def _on_back(self, plugin : IPlugin.IPlugin) -> None:
+        if self._active_plugin is not plugin:
+            return
+        if plugin.help_showing:
+            plugin.hide_help()
+        elif not plugin.handle_back_button():
+            self._deactivate_plugin()
+
     def _deck_available(self) -> bool:
         return self._deck is not None
 
+    def _start_activation(self, plugin : IPlugin.IPlugin) -> None:
+        """
+        Activates the plugin on the activator, its activate shows the loading placeholder first.
+        """
+        # set this before we try and activate it so it blocks scroller images
+        self._active_plugin = plugin
+        self._apply_poll_stretch()
+        with self._activation_lock:
+            if plugin in self._activations:
+                # backed out of and pressed again before it finished, it carries on as the active plugin,
+                # but whatever it painted while backed out was dropped
+                self._repressed.add(plugin)
+                return
+            self._activations[plugin] = self._activator.submit(self._activate, plugin)
+
+    def _is_activating(self, plugin : Optional[IPlugin.IPlugin]) -> bool:
+        with self._activation_lock:
+            return plugin is not None and plugin in self._activations
+
+    def _cancel_activation(self) -> None:
+        """
+        Back pressed while loading, go home now and let the activation tidy itself up when it finishes.
+        """
+        self._log.info(f"Cancelled activating {self._active_plugin.name}, returning to Home screen")
+        with self._activation_lock:
+            self._active_plugin = None
+        self._apply_poll_stretch()
+        self._scroll_now()
+        self._default_layout()
+
+    def _activate(self, plugin : IPlugin.IPlugin) -> None:
+        self._activating_for.plugin = plugin
+        activated : bool = False
+        try:
+            activated = plugin.activate()
+        except Exception as ex:
+            self._log.error(f"Error activating {plugin.name} : {ex}")
+        finally:
+            self._activating_for.plugin = None
+
+        with self._activation_lock:
+            current : bool = self._active_plugin is plugin and not self._destroyed
+            repressed : bool = plugin in self._repressed
+            self._repressed.discard(plugin)
+            if current and activated and repressed:
+                # activate again to repaint it, a second activate finds its connections already made
+                self._activations[plugin] = self._activator.submit(self._activate, plugin)
+                return
+            if current:
+                del self._activations[plugin]
+        if current:
+            if activated:
+                self._apply_poll_stretch()
+                self._watch_idle()
+            else:
+                self._deactivate_plugin()
+            return
+
+        # the user went back before it finished
+        if activated:
+            plugin.deactivate()
+        else:
+            # show_loading flagged it activated before it failed
+            plugin._activated = False
+        with self._activation_lock:
+            del self._activations[plugin]
+            if self._active_plugin is plugin and not self._destroyed:
+                # and pressed it again while we tidied up
+                self._activations[plugin] = self._activator.submit(self._activate, plugin)
+
     def _deactivate_plugin(self):
         self._log.info("Returning to Home screen")
-        if self._active_plugin is not None:
-            self._active_plugin.deactivate()
+        # back, the idle check and a failed activation can all get here at once, only one tears the plugin down
+        with self._activation_lock:
+            plugin : Optional[IPlugin.IPlugin] = self._active_plugin
             self._active_plugin = None
-        self._loop_counter = App.LOOP_COUNTER_MAX
-        self._idle_counter = 0
+        if plugin is not None:
+            # input still queued was meant for the page we are leaving
+            plugin.input_queue.clear()
+            self._dials.clear(plugin)
+            plugin.deactivate()
+        self._apply_poll_stretch()
+        if self._idle_job is not None:
+            self._idle_job.cancel()
+        self._scroll_now()
         self._default_layout()
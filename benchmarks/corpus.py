@@ -0,0 +1,67 @@
+# Realistic strings for the rendering benchmarks, taken from what the players and scrollers actually show
+
+ARTISTS : list[str] = [
+    "Godspeed You! Black Emperor",
+    "The Smashing Pumpkins",
+    "King Gizzard & The Lizard Wizard",
+    "Nick Cave & The Bad Seeds",
+    "Sigur Rós",
+    "...And You Will Know Us By The Trail Of Dead",
+    "Explosions In The Sky",
+    "Boards Of Canada",
+    "Daft Punk",
+    "Yeah Yeah Yeahs",
+]
+
+ALBUMS : list[str] = [
+    "Lift Your Skinny Fists Like Antennas To Heaven",
+    "Mellon Collie And The Infinite Sadness (Deluxe Edition) [Remastered 2012]",
+    "I'm In Your Mind Fuzz",
+    "Murder Ballads - Live At The Royal Albert Hall",
+    "( )",
+    "Source Tags & Codes | 20th Anniversary",
+    "The Earth Is Not A Cold Dead Place",
+    "Music Has The Right To Children [Warp CD 55]",
+    "Random Access Memories (10th Anniversary Edition)",
+    "Fever To Tell",
+]
+
+TRACKS : list[str] = [
+    "Storm",
+    "Tonight, Tonight",
+    "Cellophane - 2014 Remaster",
+    "Red Right Hand (Live)",
+    "Untitled #8 [Popplagið]",
+    "How Near How Far",
+    "Your Hand In Mine",
+    "Roygbiv",
+    "Get Lucky (feat. Pharrell Williams & Nile Rodgers)",
+    "Maps | Acoustic",
+]
+
+def player_info() -> list[str]:
+    """
+    Multi line pages, as shown by IPlayer while browsing and by VlcPlayer.show_now_playing
+    """
+    results : list[str] = []
+    for i, artist in enumerate(ARTISTS):
+        album : str = ALBUMS[i % len(ALBUMS)]
+        track : str = TRACKS[i % len(TRACKS)]
+        results.append(f"{artist}\n:- {i + 1} - {album}\n :- {i + 1} - {track}")
+        results.append(f"song: {track}\nalbum: {album}\nartist: {artist}")
+    return results
+
+def scroller_pages() -> list[str]:
+    return [
+        "12:45",
+        "Saturday 17 October",
+        "Humidity: 81 %\nPressure: 1012.3 hPa\nCloud cover: 100 %",
+        "Temperature: 11.4 °C\nPrecipitation: 0.2 mm\nWind: 14.2 km/h (WSW)",
+        "Sunrise: 07:41\nSunset: 18:22",
+        "Temperature\n[ 8.1 <---> 13.9°C ]",
+        "Alphabet Inc. - (GOOGL)\n$ 164.74\n+1.23% today at 15:30",
+        "Linux 6.1.0-rpi7-rpi-v8\nUp 12 days, 3:04\nLoad 0.12 0.09 0.08",
+    ]
+
+def single_lines() -> list[str]:
+    return ARTISTS + ALBUMS + TRACKS + [f"{a} - {b}" for a, b in zip(ARTISTS, ALBUMS)]
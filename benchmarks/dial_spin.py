@@ -0,0 +1,66 @@
+"""
+Spins a dial through an 800 artist list, one handler call per detent against the services.dial_aggregator.DialAggregator.
+
+    python -m benchmarks.dial_spin
+
+Each handler call stands in for a browse step, moving the index and rendering the name.
+"""
+from services.action_queue import ActionQueue
+from services.dial_aggregator import DialAggregator
+from services.timers import TimerService
+
+import time
+
+ARTISTS : int = 800
+RENDER_TIME : float = 0.012
+DETENTS : int = 300
+DETENT_INTERVAL : float = 0.005
+
+class FakePlugin():
+    ACCELERATED_DIALS : frozenset[int] = frozenset({ 0 })
+
+    def __init__(self) -> None:
+        self.input_queue : ActionQueue = ActionQueue("bench-input")
+        self.index : int = 0
+        self.renders : int = 0
+
+    def on_dial_turned(self, deck, dial, value) -> None:
+        self.index = (self.index + value) % ARTISTS
+        self.renders += 1
+        time.sleep(RENDER_TIME)
+
+def spin(turn) -> float:
+    for _ in range(DETENTS):
+        turn(1)
+        time.sleep(DETENT_INTERVAL)
+    return time.perf_counter()
+
+def settle(plugin : FakePlugin, last_detent : float) -> float:
+    # a little longer than a frame, so nothing is still waiting on a timer
+    time.sleep(0.05)
+    while plugin.input_queue.depth > 0:
+        time.sleep(0.001)
+    time.sleep(RENDER_TIME)
+    return max(0.0, time.perf_counter() - last_detent - 0.05 - RENDER_TIME)
+
+def run(name : str, plugin : FakePlugin, turn) -> None:
+    last_detent : float = spin(turn)
+    lag : float = settle(plugin, last_detent)
+    print(f"{name:<24} {plugin.renders:>5} renders  moved {plugin.index:>4} artists  settled {lag * 1000:>7.1f} ms after the last detent")
+
+def main() -> None:
+    print(f"== {DETENTS} detents, {1 / DETENT_INTERVAL:.0f} a second, {RENDER_TIME * 1000:.0f}ms per render, {ARTISTS} artists")
+
+    plugin : FakePlugin = FakePlugin()
+    run("before: every detent", plugin, lambda value: plugin.input_queue.submit(plugin.on_dial_turned, None, 0, value))
+
+    timers : TimerService = TimerService()
+    timers.start()
+    dials : DialAggregator = DialAggregator(timers)
+    plugin = FakePlugin()
+    run("after: aggregator", plugin, lambda value: dials.turn(plugin, None, 0, value))
+    print(f"    aggregator stats {dials.stats}")
+    timers.stop()
+
+if __name__ == "__main__":
+    main()
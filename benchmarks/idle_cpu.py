@@ -0,0 +1,75 @@
+"""
+CPU time the app spends with nobody at the deck, in each idle tier, headless against a virtual StreamDeck+.
+
+    python -m benchmarks.idle_cpu [seconds]
+
+Time runs 150x faster than real, a 15s scroll is 0.1s here, and a plugin poller doing a text render stands in
+for the FireTV / Velux / now playing polls. The weather scroller is network backed in the real config,
+here it is a text scroller flagged as such, so nothing leaves the machine.
+"""
+from app import App
+from devices import VirtualStreamDeckPlus
+from plugins.IPlugin import IPlugin
+from scrollers.text.text import TextScroller
+from services.idle import IdleTier
+
+import logging
+import sys
+import time
+
+SPEED_UP : float = 150.0
+POLL_INTERVAL : float = 16.0
+
+FONT : dict = {
+    "font_path": "font/StreamdeckTerminator.ttf",
+    "font_size": 80,
+    "background_color": "black"
+}
+
+class NetworkScroller(TextScroller):
+    @property
+    def uses_network(self) -> bool:
+        return True
+
+def run(tier : IdleTier, seconds : float) -> None:
+    deck : VirtualStreamDeckPlus = VirtualStreamDeckPlus()
+    app : App = App(deck, {
+        "font": FONT,
+        "brightness": { "minimum": 10, "press_to_wake": 30 },
+        "plugins": [],
+        "scrollers": [
+            { "name": "clock", "class": "clock", "config": { "format": "%H:%M" } },
+            { "name": "news", "class": "text", "config": { "lines": [ "Hello,\nHow are you?", "Second page", "Third page" ] } },
+            { "name": "weather", "class": "text", "config": { "lines": [ "Sunny\n21C", "Tomorrow\nRain" ] } }
+        ],
+        # tiers are forced below, not reached by waiting
+        "idle_tiers": { "enabled": False }
+    })
+    app.run()
+    app._scrollers[2].__class__ = NetworkScroller
+    poller : IPlugin = IPlugin(app, { "name": "poller", "class": "blank", "config": {} }, FONT)
+    polls : list[int] = [ 0 ]
+    def poll() -> None:
+        polls[0] += 1
+        poller._text_to_image(f"Now playing\npoll {polls[0]}", FONT["font_size"], FONT["font_path"], "black")
+    app.tasks.every(POLL_INTERVAL / SPEED_UP, poll, "poller")
+    app._set_idle_tier(tier)
+
+    frames_before : int = len(deck.writes("touchscreen"))
+    cpu_start : float = time.process_time()
+    time.sleep(seconds)
+    cpu : float = time.process_time() - cpu_start
+    frames : int = len(deck.writes("touchscreen")) - frames_before
+    app.destroy()
+    print(f"{tier.name:<8} cpu {cpu * 1000:>8.1f} ms  {cpu / seconds * 100:>5.1f}% of a core  {frames:>4} frames  {polls[0]:>4} polls")
+
+def main() -> None:
+    logging.basicConfig(level = "WARNING")
+    seconds : float = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    App.SCROLL_INTERVAL = 15.0 / SPEED_UP
+    print(f"== {seconds:.0f}s per tier, {SPEED_UP:.0f}x real time")
+    for tier in IdleTier:
+        run(tier, seconds)
+
+if __name__ == "__main__":
+    main()
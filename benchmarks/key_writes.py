@@ -0,0 +1,94 @@
+"""
+Compares painting a page of keys one lock acquisition at a time with the batched render.key_writer.KeyWriter,
+while a touchscreen producer keeps taking the deck lock.
+
+    python -m benchmarks.key_writes
+"""
+from render.key_writer import KeyWriter
+
+import statistics
+import threading
+import time
+
+KEY_COUNT : int = 8
+KEY_WRITE_TIME : float = 0.002
+TOUCHSCREEN_WRITE_TIME : float = 0.008
+PAGES : int = 50
+
+class FakeDeck():
+    # sleeps for roughly the time a usb report takes on a StreamDeck+
+    def set_key_image(self, key, image) -> None:
+        time.sleep(KEY_WRITE_TIME)
+
+    def set_touchscreen_image(self, image, x, y, width, height) -> None:
+        time.sleep(TOUCHSCREEN_WRITE_TIME)
+
+class FakeApp():
+    def __init__(self) -> None:
+        self.deck : FakeDeck = FakeDeck()
+
+def touchscreen_producer(deck : FakeDeck, lock : threading.Lock, stop : threading.Event) -> None:
+    while not stop.is_set():
+        with lock:
+            deck.set_touchscreen_image(b"", 0, 0, 800, 100)
+        time.sleep(0.001)
+
+def page(n : int) -> dict[int, bytes]:
+    # the activation path sets a key, then overwrites part of the layout straight after
+    layout : dict[int, bytes] = { k: None for k in range(1, KEY_COUNT) }
+    layout[0] = b"back"
+    for k in range(1, 5):
+        layout[k] = f"page{n}-key{k}".encode()
+    return layout
+
+def one_by_one(app : FakeApp, lock : threading.Lock) -> list[float]:
+    # what App.set_button_image did before, a key at a time, skipping keys already showing the image
+    shown : dict[int, bytes] = {}
+    latencies : list[float] = []
+    for n in range(PAGES):
+        start : float = time.perf_counter()
+        layout : dict[int, bytes] = page(n)
+        for key, image in layout.items():
+            with lock:
+                if key in shown and shown[key] == image:
+                    continue
+                app.deck.set_key_image(key, image)
+                shown[key] = image
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def batched(app : FakeApp, lock : threading.Lock) -> list[float]:
+    writer : KeyWriter = KeyWriter(app, lock)
+    writer.start()
+    latencies : list[float] = []
+    for n in range(PAGES):
+        start : float = time.perf_counter()
+        layout : dict[int, bytes] = page(n)
+        writer.submit({ k: None for k in layout })
+        writer.submit(layout)
+        writer.flush()
+        latencies.append(time.perf_counter() - start)
+    writer.stop()
+    print(f"    writer stats {writer.stats}")
+    return latencies
+
+def run(name : str, painter) -> None:
+    app : FakeApp = FakeApp()
+    lock : threading.Lock = threading.Lock()
+    stop : threading.Event = threading.Event()
+    producer : threading.Thread = threading.Thread(target = touchscreen_producer, args = (app.deck, lock, stop), daemon = True)
+    producer.start()
+    latencies : list[float] = painter(app, lock)
+    stop.set()
+    producer.join()
+    latencies.sort()
+    p95 : float = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<24} {PAGES:>4} pages  median {statistics.median(latencies) * 1000:>7.1f} ms  p95 {p95 * 1000:>7.1f} ms")
+
+def main() -> None:
+    print(f"== {KEY_COUNT} keys, {KEY_WRITE_TIME * 1000:.0f}ms per key, touchscreen holding the lock {TOUCHSCREEN_WRITE_TIME * 1000:.0f}ms at a time")
+    run("before: one by one", one_by_one)
+    run("after: key writer", batched)
+
+if __name__ == "__main__":
+    main()
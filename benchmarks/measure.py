@@ -0,0 +1,71 @@
+# Shared timing and allocation helpers for the benchmarks
+from typing import Callable, Iterable, NamedTuple
+
+import time
+import tracemalloc
+
+class Result(NamedTuple):
+    name : str
+    calls : int
+    p50 : float
+    p95 : float
+    p99 : float
+    max : float
+    peak_bytes : float
+    retained_bytes : float
+
+def percentile(samples : list[float], p : float) -> float:
+    if not samples:
+        return 0.0
+    ordered : list[float] = sorted(samples)
+    index : int = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def measure(name : str, fn : Callable, inputs : Iterable, repeats : int = 5) -> Result:
+    """
+    Times every call, then runs the inputs once more under tracemalloc for the per call allocations,
+    so the tracing overhead does not end up in the latencies.
+    """
+    inputs = list(inputs)
+    fn(inputs[0])
+    latencies : list[float] = []
+    for _ in range(repeats):
+        for item in inputs:
+            start : float = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - start)
+
+    peaks : list[int] = []
+    retained : list[int] = []
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            before : int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(item)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name,
+        len(latencies),
+        percentile(latencies, 50),
+        percentile(latencies, 95),
+        percentile(latencies, 99),
+        max(latencies),
+        sum(peaks) / len(peaks),
+        sum(retained) / len(retained)
+    )
+
+def print_header() -> None:
+    print(f"{'':<34} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'peak KB':>9} {'kept KB':>8}")
+
+def print_result(result : Result) -> None:
+    print(
+        f"{result.name:<34} {result.calls:>6} "
+        f"{result.p50 * 1000:>8.2f} {result.p95 * 1000:>8.2f} {result.p99 * 1000:>8.2f} {result.max * 1000:>8.2f} "
+        f"{result.peak_bytes / 1024:>9.1f} {result.retained_bytes / 1024:>8.1f}"
+    )
@@ -0,0 +1,96 @@
+"""
+Per call latency percentiles and allocations for the text and icon rendering paths,
+run headless against a virtual StreamDeck+ (800x100 touchscreen, 120x120 keys).
+
+    python -m benchmarks.rendering [repeats]
+
+Allocations are what tracemalloc sees, Pillow's pixel buffers live outside the python heap and are not included.
+"""
+from app import App
+from devices import VirtualStreamDeckPlus
+from plugins.IPlugin import IPlugin
+from render.fonts import font_cache
+from render.icon_bundle import IconBundle, build, encode_icon, find_icons
+from scrollers.IScroller import ScrollerFactory
+
+import logging
+import os
+import sys
+import tempfile
+
+from .corpus import player_info, scroller_pages, single_lines
+from .measure import measure, print_header, print_result
+
+FONT : dict = {
+    "font_path": "font/StreamdeckTerminator.ttf",
+    "font_size": 80,
+    "background_color": "black"
+}
+
+def main() -> None:
+    logging.basicConfig(level = "WARNING")
+    repeats : int = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    deck : VirtualStreamDeckPlus = VirtualStreamDeckPlus()
+    app : App = App(deck, { "font": FONT, "plugins": [], "scrollers": [] })
+    plugin : IPlugin = IPlugin(app, { "name": "bench", "class": "blank", "config": {} }, FONT)
+    scroller = ScrollerFactory.create_scroller(app, { "name": "bench", "class": "text", "config": { "lines": [] } }, FONT)
+    icons : list = find_icons()
+
+    print(f"== touchscreen {app.screen_width}x{app.screen_height}, keys {deck.KEY_PIXEL_WIDTH}x{deck.KEY_PIXEL_HEIGHT}, {repeats} repeats")
+    print_header()
+
+    font_cache().clear()
+    print_result(measure(
+        "IPlugin._text_to_image centred",
+        lambda text: plugin._text_to_image(text, FONT["font_size"], FONT["font_path"], "black"),
+        single_lines(),
+        repeats
+    ))
+    print_result(measure(
+        "IPlugin._text_to_image multi line",
+        lambda text: plugin._text_to_image(text, FONT["font_size"], FONT["font_path"], "black"),
+        player_info(),
+        repeats
+    ))
+    x, y, width, height = app.dial_zone(3)
+    print_result(measure(
+        "IPlugin._zone_to_image",
+        lambda text: plugin._zone_to_image(text, FONT["font_size"], FONT["font_path"], "black", width, height),
+        [ f"Volume\n{v}%" for v in range(0, 101, 5) ],
+        repeats
+    ))
+    print_result(measure(
+        "IScroller._render",
+        scroller._render,
+        scroller_pages(),
+        repeats
+    ))
+
+    print_result(measure(
+        "encode_icon, live",
+        lambda path: encode_icon(path, 100),
+        icons,
+        1
+    ))
+    with tempfile.TemporaryDirectory() as folder:
+        bundle_path : str = os.path.join(folder, "icons.bundle")
+        build(bundle_path, icons)
+        bundle : IconBundle = IconBundle(bundle_path)
+        bundle.open()
+        print_result(measure(
+            "IconBundle.get",
+            lambda path: bundle.get(path, 100),
+            icons,
+            repeats
+        ))
+        app._icon_bundle = bundle
+        print_result(measure(
+            "App.load_image, shared store",
+            lambda path: app.load_image(path, 100),
+            icons,
+            repeats
+        ))
+
+if __name__ == "__main__":
+    main()
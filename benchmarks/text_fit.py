@@ -0,0 +1,77 @@
+"""
+Compares the old 2 point decrement fitting loop with the bisection in render.text_fit.
+
+    python -m benchmarks.text_fit [font_path]
+"""
+from PIL import ImageFont
+from render.fonts import font_cache, get_font
+from render.text_fit import fit_font_size, MIN_FONT_SIZE
+from typing import Callable, Tuple
+
+import sys
+import time
+
+from .corpus import single_lines
+
+DEFAULT_FONT : str = "font/StreamdeckTerminator.ttf"
+SCREEN_WIDTH : int = 800
+SCROLLER_WIDTH : int = 800 - 100 - 10
+START_SIZES : list[int] = [ 80, 40, 26 ]
+REPEATS : int = 20
+
+def decrement_loop(text : str, font_path : str, font_size : int, max_width : int, loader : Callable) -> Tuple[int, int]:
+    # the loop IPlugin._text_to_image and IScroller._render used to run
+    iterations : int = 1
+    f = loader(font_path, font_size)
+    text_width = f.getlength(text)
+    while text_width > max_width and font_size > MIN_FONT_SIZE:
+        font_size -= 2
+        iterations += 1
+        f = loader(font_path, font_size)
+        text_width = f.getlength(text)
+    return font_size, iterations
+
+def bisection(text : str, font_path : str, font_size : int, max_width : int, loader : Callable) -> Tuple[int, int]:
+    result = fit_font_size(text, font_path, font_size, max_width)
+    return result.size, result.iterations
+
+def run(name : str, fitter : Callable, loader : Callable, font_path : str, max_width : int) -> None:
+    lines : list[str] = single_lines()
+    total_iterations : int = 0
+    worst : int = 0
+    calls : int = 0
+    start : float = time.perf_counter()
+    for _ in range(REPEATS):
+        for size in START_SIZES:
+            for line in lines:
+                _, iterations = fitter(line, font_path, size, max_width, loader)
+                total_iterations += iterations
+                worst = max(worst, iterations)
+                calls += 1
+    elapsed : float = time.perf_counter() - start
+    print(f"{name:<34} {calls:>6} fits  {total_iterations / calls:>6.2f} avg iter  {worst:>3} max iter  {elapsed * 1e6 / calls:>9.1f} us/fit")
+
+def main() -> None:
+    font_path : str = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FONT
+
+    def truetype(path, size):
+        return ImageFont.truetype(path, size)
+
+    for label, width in (("touchscreen", SCREEN_WIDTH), ("scroller", SCROLLER_WIDTH)):
+        print(f"== {label} width {width}px, start sizes {START_SIZES}")
+        font_cache().clear()
+        run("before: decrement, truetype load", decrement_loop, truetype, font_path, width)
+        run("decrement, font cache", decrement_loop, get_font, font_path, width)
+        font_cache().clear()
+        run("after: bisection, font cache", bisection, get_font, font_path, width)
+
+    # sanity check, bisection never picks a smaller size than the decrement loop
+    for line in single_lines():
+        for size in START_SIZES:
+            old, _ = decrement_loop(line, font_path, size, SCREEN_WIDTH, get_font)
+            new, _ = bisection(line, font_path, size, SCREEN_WIDTH, get_font)
+            if new < old:
+                print(f"Regression for '{line}' @ {size} : {new} < {old}")
+
+if __name__ == "__main__":
+    main()
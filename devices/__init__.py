@@ -0,0 +1 @@
+from .virtual_deck import VirtualStreamDeckPlus, WriteRecord, InputEvent
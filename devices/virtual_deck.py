@@ -0,0 +1,196 @@
+from StreamDeck.Devices.StreamDeck import DialEventType
+from StreamDeck.Devices.StreamDeckPlus import StreamDeckPlus
+from StreamDeck.ProductIDs import USBVendorIDs, USBProductIDs
+from StreamDeck.Transport.Dummy import Dummy
+from typing import NamedTuple, Optional
+
+import logging
+import os
+import threading
+import time
+
+class WriteRecord(NamedTuple):
+    timestamp : float
+    kind : str
+    target : tuple
+    size : int
+
+class InputEvent(NamedTuple):
+    at : float
+    kind : str
+    index : int
+    value : int = 0
+
+class VirtualStreamDeckPlus(StreamDeckPlus):
+    """
+    A StreamDeck+ with no hardware behind it, for running the whole app headless.
+    Every key, touchscreen and brightness write is recorded with a timestamp and payload size
+    instead of going out over usb, and key / dial events can be injected on a schedule.
+    Timestamps are time.monotonic(), so they can be compared with the injected events.
+    """
+
+    KEY = "key"
+    TOUCHSCREEN = "touchscreen"
+    BRIGHTNESS = "brightness"
+
+    KEY_PRESS = "key_press"
+    DIAL_TURN = "dial_turn"
+    DIAL_PUSH = "dial_push"
+
+    def __init__(self, usb_bytes_per_second : float = 0.0) -> None:
+        """
+        usb_bytes_per_second, when set, makes each write sleep for as long as the payload would take on the wire.
+        """
+        super().__init__(Dummy.Device(USBVendorIDs.USB_VID_ELGATO, USBProductIDs.USB_PID_STREAMDECK_PLUS))
+        self._usb_bytes_per_second : float = usb_bytes_per_second
+        self._open : bool = False
+        self._writes : list[WriteRecord] = []
+        self._inputs : list[tuple[float, InputEvent]] = []
+        self._condition : threading.Condition = threading.Condition()
+        self._input_thread : Optional[threading.Thread] = None
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    # the transport side, no reader thread, input only arrives through inject
+
+    def open(self) -> None:
+        self._open = True
+
+    def close(self) -> None:
+        self._open = False
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def connected(self) -> bool:
+        return True
+
+    def reset(self) -> None:
+        pass
+
+    def get_serial_number(self) -> str:
+        return "VIRTUAL"
+
+    def get_firmware_version(self) -> str:
+        return "0.0.0"
+
+    def set_brightness(self, percent) -> None:
+        if isinstance(percent, float):
+            percent = int(100.0 * percent)
+        self._record(VirtualStreamDeckPlus.BRIGHTNESS, (min(max(percent, 0), 100),), 0)
+
+    def set_key_image(self, key, image) -> None:
+        if min(max(key, 0), self.KEY_COUNT) != key:
+            raise IndexError(f"Invalid key index {key}.")
+        self._record(VirtualStreamDeckPlus.KEY, (key,), len(image) if image else 0)
+
+    def set_touchscreen_image(self, image, x_pos = 0, y_pos = 0, width = 0, height = 0) -> None:
+        if not image:
+            x_pos, y_pos, width, height = 0, 0, self.TOUCHSCREEN_PIXEL_WIDTH, self.TOUCHSCREEN_PIXEL_HEIGHT
+        if min(max(width, 1), self.TOUCHSCREEN_PIXEL_WIDTH - x_pos) != width:
+            raise IndexError(f"Invalid draw width {width}.")
+        if min(max(height, 1), self.TOUCHSCREEN_PIXEL_HEIGHT - y_pos) != height:
+            raise IndexError(f"Invalid draw height {height}.")
+        self._record(VirtualStreamDeckPlus.TOUCHSCREEN, (x_pos, y_pos, width, height), len(image) if image else 0)
+
+    # recording
+
+    def _record(self, kind : str, target : tuple, size : int) -> None:
+        if self._usb_bytes_per_second > 0 and size > 0:
+            time.sleep(size / self._usb_bytes_per_second)
+        with self._condition:
+            self._writes.append(WriteRecord(time.monotonic(), kind, target, size))
+            self._condition.notify_all()
+
+    def writes(self, kind : Optional[str] = None, since : float = 0.0) -> list[WriteRecord]:
+        with self._condition:
+            return [ w for w in self._writes if w.timestamp >= since and (kind is None or w.kind == kind) ]
+
+    def clear_writes(self) -> None:
+        with self._condition:
+            self._writes.clear()
+            self._inputs.clear()
+
+    def wait_for_write(self, kind : Optional[str] = None, since : float = 0.0, timeout : float = 5.0) -> Optional[WriteRecord]:
+        """
+        Blocks until there is a write of kind at or after since, returning the first one, or None on timeout.
+        """
+        deadline : float = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for w in self._writes:
+                    if w.timestamp >= since and (kind is None or w.kind == kind):
+                        return w
+                remaining : float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    # input
+
+    def press_key(self, key : int, hold : float = 0.05) -> float:
+        """
+        Presses and releases a key on the calling thread, returning when the press was delivered.
+        """
+        at : float = self._deliver(InputEvent(0, VirtualStreamDeckPlus.KEY_PRESS, key, 1))
+        time.sleep(hold)
+        self._deliver(InputEvent(0, VirtualStreamDeckPlus.KEY_PRESS, key, 0))
+        return at
+
+    def turn_dial(self, dial : int, amount : int) -> float:
+        return self._deliver(InputEvent(0, VirtualStreamDeckPlus.DIAL_TURN, dial, amount))
+
+    def push_dial(self, dial : int, hold : float = 0.05) -> float:
+        at : float = self._deliver(InputEvent(0, VirtualStreamDeckPlus.DIAL_PUSH, dial, 1))
+        time.sleep(hold)
+        self._deliver(InputEvent(0, VirtualStreamDeckPlus.DIAL_PUSH, dial, 0))
+        return at
+
+    def play(self, script : list[InputEvent]) -> threading.Thread:
+        """
+        Delivers the events on their own thread, like the usb reader would, each at its offset in seconds from now.
+        """
+        def run() -> None:
+            start : float = time.monotonic()
+            for event in sorted(script, key = lambda e: e.at):
+                delay : float = start + event.at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self._deliver(event)
+        self._input_thread = threading.Thread(target = run, name = "virtual-input", daemon = True)
+        self._input_thread.start()
+        return self._input_thread
+
+    def _deliver(self, event : InputEvent) -> float:
+        at : float = time.monotonic()
+        with self._condition:
+            self._inputs.append((at, event))
+        try:
+            match event.kind:
+                case VirtualStreamDeckPlus.KEY_PRESS:
+                    if self.key_callback is not None:
+                        self.key_callback(self, event.index, bool(event.value))
+                case VirtualStreamDeckPlus.DIAL_TURN:
+                    if self.dial_callback is not None:
+                        self.dial_callback(self, event.index, DialEventType.TURN, event.value)
+                case VirtualStreamDeckPlus.DIAL_PUSH:
+                    if self.dial_callback is not None:
+                        self.dial_callback(self, event.index, DialEventType.PUSH, bool(event.value))
+        except Exception as ex:
+            self._log.error(f"Error delivering {event} : {ex}")
+        return at
+
+    def input_to_pixel(self, kind : Optional[str] = None) -> list[float]:
+        """
+        For every injected press or turn, the seconds until the next write of kind, if one happened before the next input.
+        """
+        with self._condition:
+            inputs : list[float] = [ at for at, e in self._inputs if e.value ]
+            writes : list[float] = [ w.timestamp for w in self._writes if kind is None or w.kind == kind ]
+        latencies : list[float] = []
+        for i, at in enumerate(inputs):
+            until : float = inputs[i + 1] if i + 1 < len(inputs) else float("inf")
+            following = [ t for t in writes if at <= t < until ]
+            if following:
+                latencies.append(following[0] - at)
+        return latencies
@@ -4,27 +4,25 @@ import os
 import textwrap
 
 from abc import ABC
+from concurrent.futures import Executor, Future
 from pathlib import Path
-from PIL import Image,ImageDraw, ImageFont
-from . import blank as blank_plugin
-from . import bluetooth as bluetooth_plugin
-from . import firetv as firetv_plugin
-from . import hue as hue_plugin
-from . import jellyfin as jellyfin_plugin
-from . import levoit as levoit_plugin
-from . import radio as radio_plugin
-from . import settings as settings_plugin
-from . import subsonic as subsonic_plugin
-from . import tado as tado_plugin
-from . import tuya as tuya_plugin
-from . import velux as velux_plugin
+from PIL import Image,ImageDraw
+from render.fonts import get_font
+from render.frame_cache import FrameCache
+from render.text_fit import fit_font_size
+from services.action_queue import ActionQueue
+from services.registry import ModuleRegistry
+from services.startup_profile import startup_profiler
+from typing import Optional
 import threading
 import time
 
 class IPlugin(ABC):
 
-    _RenderLock : threading.Lock = threading.Lock()
     LongPressDelta : float = 1.0
+    # dials whose step grows with the speed of the spin, and the dials wanting a longer frame than the app's
+    ACCELERATED_DIALS : frozenset[int] = frozenset()
+    DIAL_FRAME_INTERVALS : dict[int, float] = {}
 
     def __init__(self, app, config, font) -> None:
         super().__init__()
@@ -41,16 +39,31 @@ class IPlugin(ABC):
         self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
         self._help_message : str = "This is a default help message\nPlease override me\nin your own plugin"
         self._help_showing : bool = False
+        # cleared while a warm up is running, activate waits on it rather than connecting twice
+        self._warm_up_done : threading.Event = threading.Event()
+        self._warm_up_done.set()
+        self._warm_up_stats : Optional[dict] = None
+        # key and dial handlers run in order on here, never on the deck's reader thread
+        self._input_queue : ActionQueue = ActionQueue(f"{self._class}-input")
+
+    def show_loading(self) -> None:
+        """
+        The placeholder shown while activating, a loading message with the back key and the others cleared.
+        """
+        self._activated = True
+        self._render(f"Loading {self._name}", self._font["font_size"] / 2)
+        # back button, and clear the others, in one burst
+        layout : dict[int, bytes] = { n: None for n in range(1, self._app.num_buttons) }
+        layout[0] = self.back_button
+        self._app.set_button_images(layout)
 
     def activate(self) -> bool:
         try:
-            self._activated = True
-            self._render(f"Loading {self._name}", self._font["font_size"] / 2)
+            self.show_loading()
+            if not self._warm_up_done.is_set():
+                self._log.info(f"{self._class} :: waiting for the warm up to finish")
+                self._warm_up_done.wait()
             self._log.info(f"{self._class} :: activated")
-            self._app.set_button_image(0, self.back_button)
-            # clear others
-            for n in range(1, self._app.num_buttons):
-                self._app.set_button_image(n, None)
         except Exception as ex:
             self._log.error(f"Error activating plugin: {ex}")
             self._activated = False
@@ -67,6 +80,50 @@ class IPlugin(ABC):
     def run_as_daemon(self) -> None:
         self._log.info(f"{self._class} :: running as daemon")
 
+    def warm_up(self) -> None:
+        """
+        Makes the slow connections activate would otherwise wait on, called once in the background after startup.
+        Don't touch the deck here, and leave things as they were when it fails, so activate tries again and reports it.
+        """
+        pass
+
+    @property
+    def input_queue(self) -> ActionQueue:
+        return self._input_queue
+
+    @property
+    def can_warm_up(self) -> bool:
+        return type(self).warm_up is not IPlugin.warm_up
+
+    @property
+    def warm_up_stats(self) -> Optional[dict]:
+        return self._warm_up_stats
+
+    def start_warm_up(self, executor : Executor) -> Future:
+        self._warm_up_done.clear()
+        try:
+            return executor.submit(self._run_warm_up)
+        except RuntimeError:
+            self._warm_up_done.set()
+            raise
+
+    def _run_warm_up(self) -> bool:
+        start : float = time.monotonic()
+        succeeded : bool = True
+        try:
+            self.warm_up()
+        except Exception as ex:
+            self._log.warning(f"{self._class} :: warm up failed : {ex}")
+            succeeded = False
+        finally:
+            duration : float = time.monotonic() - start
+            self._warm_up_stats = { "ok": succeeded, "ms": round(duration * 1000, 1) }
+            self._warm_up_done.set()
+        if succeeded:
+            self._log.info(f"{self._class} :: warmed up in {duration:.2f}s")
+        startup_profiler().mark(f"warm_up.{self._name}")
+        return succeeded
+
     def on_button_press(self, deck, key, key_state):
         self._log.debug(f"{self._name} :: {self._class} :: handling key: {key} state: {key_state}")
 
@@ -112,8 +169,13 @@ class IPlugin(ABC):
         return self._help_showing
 
     def _load_images(self, collection, keys):
+        """
+        Appends the images for keys to collection, and returns it.
+        The images are shared app wide, so never modify them in place.
+        """
         for image in keys:
             collection.append(self._app.load_image(f"{self._plugin_path}/images/{image}"))
+        return collection
 
     def _wrap(self, index, length):
         if length == 0:
@@ -121,12 +183,14 @@ class IPlugin(ABC):
         return (index + length) % length
 
     def _render(self, text : str, font_size : int = -1, font_path : str = "", bg_color : str = "black") -> bool:
+        """
+        Queues the text for the touchscreen and returns straight away.
+        The compositor renders and shows it, unless a newer frame replaces it first.
+        """
         if not self._activated:
             return False
         if self._app.deck is None:
             return False
-        if not IPlugin._RenderLock.acquire(blocking=False):
-            return False
         success : bool = False
         try:
             if font_size < 0:
@@ -142,15 +206,81 @@ class IPlugin(ABC):
                 "bg_color": bg_color
             }
 
-            b : bytes = self._text_to_image(text, font_size, font_path, bg_color)
-            self._app.deck.set_touchscreen_image(b, 0, 0, self._app.screen_width, self._app.screen_height)
+            width : int = self._app.screen_width
+            height : int = self._app.screen_height
+            key = FrameCache.key(text, font_size, font_path, bg_color, width, height)
+            self._app.compositor.submit(
+                lambda: self._app.frame_cache.get_or_render(
+                    key,
+                    lambda: self._text_to_image(text, font_size, font_path, bg_color)
+                ),
+                0, 0, width, height,
+                guard = self._is_activated
+            )
+            success = True
+        except Exception as ex:
+            self._log.error(ex)
+        return success
+
+    def _render_zone(self, dial : int, text : str, font_size : int = -1, font_path : str = "", bg_color : str = "black") -> bool:
+        """
+        Queues the text for just the strip of touchscreen above the dial, for incremental updates.
+        A quarter of the pixels to encode and send, the rest of the screen is left as it is.
+        """
+        if not self._activated:
+            return False
+        if self._app.deck is None:
+            return False
+        if dial < 0 or dial >= self._app.num_dials:
+            return False
+        success : bool = False
+        try:
+            if font_size < 0:
+                font_size = self._font["font_size"]
+            if not font_path:
+                font_path = self._font["font_path"]
+
+            x, y, width, height = self._app.dial_zone(dial)
+            key = FrameCache.key(text, font_size, font_path, bg_color, width, height)
+            self._app.compositor.submit(
+                lambda: self._app.frame_cache.get_or_render(
+                    key,
+                    lambda: self._zone_to_image(text, font_size, font_path, bg_color, width, height)
+                ),
+                x, y, width, height,
+                guard = self._is_activated
+            )
             success = True
         except Exception as ex:
             self._log.error(ex)
-        finally:
-            IPlugin._RenderLock.release()
         return success
 
+    def _is_activated(self) -> bool:
+        # not once the user has left it, even if it hasn't noticed yet
+        return self._activated and self._app.active_plugin is self
+
+    def _zone_to_image(self, text : str, font_size : int, font_path : str, bg_color : str, width : int, height : int) -> bytes:
+        try:
+            image = Image.new(mode = "RGB", size = (width, height), color = bg_color)
+            draw = ImageDraw.Draw(image)
+
+            lines : list[str] = text.split('\n')[:3]
+            num_lines : int = len(lines)
+            line_height : int = int(height / num_lines)
+            font_size = int(font_size / num_lines)
+            for i, line in enumerate(lines):
+                _, f, _ = fit_font_size(line, font_path, font_size, width - 10)
+                box = f.getbbox(line)
+                x = (width - f.getlength(line)) / 2
+                y = (line_height * i) + (line_height - box[3]) / 2
+                draw.text((x, y), line, font = f, fill = (255, 255, 0))
+
+            img_bytes = io.BytesIO()
+            image.save(img_bytes, format='JPEG')
+            return img_bytes.getvalue()
+        except Exception as ex:
+            raise Exception(f"Error converting text to zone image: {ex}")
+
     def _text_to_image(self, text : str, font_size : int, font_path : str, bg_color : str) -> bytes:
         try:
             image = Image.new(mode = "RGB", size = (self._app.screen_width, self._app.screen_height), color = bg_color)
@@ -162,7 +292,7 @@ class IPlugin(ABC):
             font_size = int(font_size / num_lines)
 
             if not align_centre:
-                f = ImageFont.truetype(font_path, font_size)
+                f = get_font(font_path, font_size)
                 x = 10
                 line_height = int((self._app.screen_height - 10) / num_lines)
                 line_gap = int(20 / num_lines)
@@ -214,16 +344,11 @@ class IPlugin(ABC):
                 total_height : int = 0
                 # get the max size that works
                 for line in lines:
-                    f = ImageFont.truetype(font_path, font_size)
-                    text_width = f.getlength(line)
-                    while text_width > self._app.screen_width and font_size > 10:
-                        font_size -= 2
-                        f = ImageFont.truetype(font_path, font_size)
-                        text_width = f.getlength(line)
+                    font_size, f, _ = fit_font_size(line, font_path, font_size, self._app.screen_width)
                     box = f.getbbox(line)
                     total_height += (box[3])
 
-                f = ImageFont.truetype(font_path, font_size)
+                f = get_font(font_path, font_size)
                 half_avg_height : int = (total_height / num_lines) / 2
                 half_line_height : int = line_height / 2
                 for i, line in enumerate(lines):
@@ -277,31 +402,24 @@ class IPlugin(ABC):
 
 class PluginFactory:
 
+    registry : ModuleRegistry = ModuleRegistry("plugins", {
+        "blank": ("plugins.blank.blank", "BlankPlugin"),
+        "bluetooth": ("plugins.bluetooth.bluetooth", "BluetoothPlugin"),
+        "firetv": ("plugins.firetv.firetv", "FireTvPlugin"),
+        "hue": ("plugins.hue.hue", "HuePlugin"),
+        "jellyfin": ("plugins.jellyfin.jellyfin", "JellyfinPlugin"),
+        "levoit": ("plugins.levoit.levoit", "LevoitPlugin"),
+        "radio": ("plugins.radio.radio", "RadioPlugin"),
+        "settings": ("plugins.settings.settings", "SettingsPlugin"),
+        "subsonic": ("plugins.subsonic.subsonic", "SubsonicPlugin"),
+        "tado": ("plugins.tado.tado", "TadoPlugin"),
+        "tuya": ("plugins.tuya.tuya", "VacuumPlugin"),
+        "velux": ("plugins.velux.velux", "VeluxPlugin")
+    })
+
     @staticmethod
     def create_plugin(app, config, font) -> IPlugin:
-        match config["class"]:
-            case "blank":
-                return blank_plugin.blank.BlankPlugin(app, config, font)
-            case "bluetooth":
-                return bluetooth_plugin.bluetooth.BluetoothPlugin(app, config, font)
-            case "firetv":
-                return firetv_plugin.firetv.FireTvPlugin(app, config, font)
-            case "hue":
-                return hue_plugin.hue.HuePlugin(app, config, font)
-            case "jellyfin":
-                return jellyfin_plugin.jellyfin.JellyfinPlugin(app, config, font)
-            case "levoit":
-                return levoit_plugin.levoit.LevoitPlugin(app, config, font)
-            case "radio":
-                return radio_plugin.radio.RadioPlugin(app, config, font)
-            case "settings":
-                return settings_plugin.settings.SettingsPlugin(app, config, font)
-            case "subsonic":
-                return subsonic_plugin.subsonic.SubsonicPlugin(app, config, font)
-            case "tado":
-                return tado_plugin.tado.TadoPlugin(app, config, font)
-            case "tuya":
-                return tuya_plugin.tuya.VacuumPlugin(app, config, font)
-            case "velux":
-                return velux_plugin.velux.VeluxPlugin(app, config, font)
-        return None
+        plugin_class = PluginFactory.registry.resolve(config["class"])
+        if plugin_class is None:
+            return None
+        return plugin_class(app, config, font)
@@ -1,14 +1 @@
 #from plugins import IPlugin
-
-from plugins.blank.blank import BlankPlugin
-from plugins.bluetooth.bluetooth import BluetoothPlugin
-from plugins.firetv.firetv import FireTvPlugin
-from plugins.hue.hue import HuePlugin
-from plugins.jellyfin.jellyfin import JellyfinPlugin
-from plugins.levoit.levoit import LevoitPlugin
-from plugins.radio.radio import RadioPlugin
-from plugins.settings.settings import SettingsPlugin
-from plugins.subsonic.subsonic import SubsonicPlugin
-from plugins.tado.tado import TadoPlugin
-from plugins.tuya.tuya import VacuumPlugin
-from plugins.velux.velux import VeluxPlugin
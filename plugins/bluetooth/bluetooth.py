@@ -1,4 +1,5 @@
 from ..IPlugin import IPlugin
+from services.timers import TimerHandle
 from enum import IntEnum
 from .helper import BluetoothManager, BluetoothController, BluetoothDevice
 import threading
@@ -32,7 +33,7 @@ class BluetoothPlugin(IPlugin):
         self._device_index : int = 0
         self._running_as_daemon : bool = False
         self._bt : BluetoothManager = BluetoothManager(app, self._callback)
-        self._notify_timer : threading.Timer = None
+        self._notify_timer : TimerHandle = None
         self._help_message = "Bluetooth plugin\nBack | Status | Scan | Power\nForget | Info | Toggle Auto | N/A"
 
     def run_as_daemon(self) -> None:
@@ -139,13 +140,13 @@ class BluetoothPlugin(IPlugin):
             case BluetoothPlugin.State.CONNECTED:
                 if dial != 0:
                     return
-                self._device_index += sorted((-1, value, 1))[1]
+                self._device_index += value
                 self._device_index = self._wrap(self._device_index, len(self._bt.devices))
                 self._show_devices()
             case BluetoothPlugin.State.DELETING:
                 if dial != 0:
                     return
-                self._device_index += sorted((-1, value, 1))[1]
+                self._device_index += value
                 self._device_index = self._wrap(self._device_index, len(self._bt.devices))
                 self._show_devices()
             case _:
@@ -210,8 +211,7 @@ class BluetoothPlugin(IPlugin):
         self._update_buttons()
         if self._notify_timer is not None:
             self._notify_timer.cancel()
-        self._notify_timer = threading.Timer(2, self._show_default)
-        self._notify_timer.start()
+        self._notify_timer = self._app.timers.call_later(2, self._show_default)
 
     def _show_default(self):
         if not self._activated: 
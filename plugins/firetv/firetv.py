@@ -1,4 +1,6 @@
 from ..IPlugin import IPlugin
+from services.periodic import PeriodicTask
+from services.timers import TimerHandle
 from .shared import IChildPlugin, MediaControlsPlugin, LiveTvPlugin, PackagesPlugin
 from .shared import FireTvKeyCommands
 
@@ -8,8 +10,6 @@ from adb_shell.auth.keygen import keygen
 from enum import IntEnum, auto
 
 import os
-import threading
-import time
 
 class FireTvPlugin(IPlugin):
 
@@ -72,8 +72,8 @@ class FireTvPlugin(IPlugin):
         self._last_volume : int = -1
         self._volume_min : int = 0
         self._volume_max : int = 0
-        self._thread : threading.Thread = None
-        self._notify_timer : threading.Timer = None
+        self._poll_task : PeriodicTask = None
+        self._notify_timer : TimerHandle = None
 
         self._help_message = "Fire TV plugin\nBack | Media | Live TV | Switch Input\nApps | Power | Alexa | Home"
 
@@ -102,26 +102,14 @@ class FireTvPlugin(IPlugin):
                     PackagesPlugin(self)
                 ]
 
-            if self._creds is None:
-                self._creds = self._get_creds()
-
-            if self._device is None:
-                ip : str = self._config["ip_address"]
-                port : int = self._config["port"]
-                self._log.debug(f"Connecting to {ip}:{port}")
-                self._device : AdbDeviceTcp = AdbDeviceTcp(
-                    host = ip, 
-                    port = port, 
-                    default_transport_timeout_s = 9.0
-                )
-
-            self._device.connect(rsa_keys = [self._creds], auth_timeout_s = 10.0)
+            # a warm up may have left us connected
+            if self._device is None or not self._device.available:
+                self._connect()
             
             self._refresh_volume()
 
-            if self._thread is None:
-                self._thread = threading.Thread(target=self._thread_loop)
-                self._thread.start()
+            if self._poll_task is None:
+                self._poll_task = self._app.tasks.every(16.0, self._poll, f"{self._class}.poll", jitter = 1.0)
 
         except Exception as ex:
             self._activated = False
@@ -129,27 +117,37 @@ class FireTvPlugin(IPlugin):
 
         return self._activated
 
-    def _thread_loop(self):
-        self._log.debug("Starting thread loop")
-        counter : int = 0
-        while (self._activated):
-            try:
-                counter += 1
-                if counter > 15:
-                    counter = 0
-                    self._refresh_wake_state()
-                    self._update_display()
-                    self._update_buttons()
-            except:
-                pass
-            time.sleep(1.0)
-        self._log.debug("Exiting thread loop")
+    def _connect(self) -> None:
+        if self._creds is None:
+            self._creds = self._get_creds()
+
+        if self._device is None:
+            ip : str = self._config["ip_address"]
+            port : int = self._config["port"]
+            self._log.debug(f"Connecting to {ip}:{port}")
+            self._device : AdbDeviceTcp = AdbDeviceTcp(
+                host = ip, 
+                port = port, 
+                default_transport_timeout_s = 9.0
+            )
+
+        self._device.connect(rsa_keys = [self._creds], auth_timeout_s = 10.0)
+
+    def warm_up(self) -> None:
+        self._connect()
+
+    def _poll(self):
+        if not self._activated:
+            return
+        self._refresh_wake_state()
+        self._update_display()
+        self._update_buttons()
 
     def deactivate(self):
         super().deactivate()
-        if self._thread is not None:
-            self._thread.join()
-            self._thread = None
+        if self._poll_task is not None:
+            self._poll_task.cancel(wait = True)
+            self._poll_task = None
         if self._device is not None:
             self._device.close()
             self._device = None
@@ -177,8 +175,7 @@ class FireTvPlugin(IPlugin):
         if not keep:
             if self._notify_timer is not None:
                 self._notify_timer.cancel()
-            self._notify_timer = threading.Timer(5.0, self._update_display)
-            self._notify_timer.start()
+            self._notify_timer = self._app.timers.call_later(5.0, self._update_display)
 
     def dials_info(self) -> str:
         result : str = "Rotate            Vol.              D / U             L / R\n"
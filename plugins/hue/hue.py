@@ -1,6 +1,4 @@
 import os
-import threading
-import time
 from ..IPlugin import IPlugin
 from enum import auto, IntEnum
 from phue import Bridge, Light, Scene, Group
@@ -43,7 +41,8 @@ class HuePlugin(IPlugin):
         POWER_OFF = auto()
         BLANK = auto()
 
-    FLUSH_SPEED : float = 0.3
+    # each step is a call to the bridge, so the modifier dials are batched up for longer
+    DIAL_FRAME_INTERVALS : dict[int, float] = { 1: 0.3, 2: 0.3, 3: 0.3 }
     
     image_keys : list[str] = [ 
         "group.png", 
@@ -70,8 +69,6 @@ class HuePlugin(IPlugin):
         self._shortcut_index : int = -1
 
         self._images : list[bytes] = None
-        self._inc_buffer : dict = {}
-        self._thread : threading.Thread = None
         self._help_message = "Hue Lights plugin\nBack | Groups | Lights | Scenes\nQuick | Color | Brightness | N/A"
 
     @property
@@ -90,94 +87,60 @@ class HuePlugin(IPlugin):
     def scenes(self) -> list[dict]:
         return self._bridge.scenes
 
-    def _flush(self):
-        self._log.info(f"{self._class} :: flush thread started")
-
-        while self._activated:
-
-            try:
-
-                brightness = self._inc_buffer.get("brightness", 0)
-                hue = self._inc_buffer.get("hue", 0)
-                saturation = self._inc_buffer.get("saturation", 0)
-
-                if brightness or hue or saturation:
-                    # reset these as fast as possible
-                    self._inc_buffer["brightness"] = self._inc_buffer["hue"] = self._inc_buffer["saturation"] = 0
-
-                    brightness = max(min(254, (brightness * 10)), -254)
-                    hue = max(min(254, (hue * 10)), -254)
-                    saturation = max(min(254, (saturation * 10)), -254)                    
-
-                    match self._state:
-                        case HuePlugin.State.LIGHTS:
-                            light : Light = self.lights[self._light_index]
-                            light.brightness += brightness
-                            light.hue += hue
-                            light.saturation += saturation
-
-                        case HuePlugin.State.GROUPS:
-                            group : Group = self.groups[self._group_index]
-                            group.brightness += brightness
-                            group.hue += hue
-                            group.saturation += saturation
-    
-                        case _:
-                            pass  
-
-                color : dict = self._inc_buffer.get("color", None)
-                if color is not None:
-
-                    red = color.get("red", 0)
-                    green = color.get("green", 0)
-                    blue = color.get("blue", 0)
-
-                    if red != 0 or green != 0 or blue != 0:
-                        # reset these as fast as possible
-                        self._inc_buffer["color"]["red"] = self._inc_buffer["color"]["green"] = self._inc_buffer["color"]["blue"] = 0
-
-                        match self._state:
-                            case HuePlugin.State.LIGHTS:
-                                light : Light = self.lights[self._light_index]
-                                if not hasattr(light, "rgb"): 
-                                    return
-
-                                light.rgb = [
-                                    max(min(255, light.rgb[0] + red), 0), 
-                                    max(min(255, light.rgb[1] + green), 0), 
-                                    max(min(255, light.rgb[2] + blue), 0)
-                                ]
-
-                                light.xy = self._converter.rgb_to_xy(
-                                    light.rgb[0], 
-                                    light.rgb[1], 
-                                    light.rgb[2])
-
-                                pass
-                            case _:
-                                pass
-
-            except Exception as ex:
-                self._log.error(ex)
-                pass
-
-            time.sleep(self.FLUSH_SPEED)
+    def _apply_levels(self, dial : int, value : int) -> None:
+        label, attribute = { 1: ("Bright", "brightness"), 2: ("Hue", "hue"), 3: ("Sat", "saturation") }[dial]
+        step : int = max(min(254, (value * 10)), -254)
+        match self._state:
+            case HuePlugin.State.LIGHTS:
+                target = self.lights[self._light_index]
+            case HuePlugin.State.GROUPS:
+                target = self.groups[self._group_index]
+            case _:
+                return
+        setattr(target, attribute, getattr(target, attribute) + step)
+        self._show_steps({ dial: (label, step) })
 
-        self._log.info(f"{self._class} :: flush thread exiting")
+    def _apply_color(self, dial : int, value : int) -> None:
+        if self._state != HuePlugin.State.LIGHTS:
+            return
+        light : Light = self.lights[self._light_index]
+        if not hasattr(light, "rgb"): 
+            return
+        rgb : list[int] = list(light.rgb)
+        rgb[dial - 1] = max(min(255, rgb[dial - 1] + value), 0)
+        light.rgb = rgb
+        light.xy = self._converter.rgb_to_xy(rgb[0], rgb[1], rgb[2])
+        self._show_steps({ dial: ([ "Red", "Green", "Blue" ][dial - 1], value) })
+
+    def _show_steps(self, steps : dict) -> None:
+        """
+        Redraws just the zones of the dials which moved, with the step that was applied.
+        """
+        for dial, (label, step) in steps.items():
+            if step != 0:
+                self._render_zone(dial, f"{label}\n{step:+d}")
+
+    def _connect(self) -> None:
+        if self._bridge is None:
+            creds_path : str = os.path.join(self._app.creds_path, self.CREDS_FILE)
+            ip : str = self._config.get("ip", None)
+            self._bridge = Bridge(ip = ip, config_file_path = creds_path)
+        self._bridge.connect()
+        self._converter = Converter()
+
+    def warm_up(self) -> None:
+        self._connect()
+        # phue keeps the light objects once it has listed them
+        self.lights
 
     def activate(self) -> bool:
         if not super().activate(): 
             return False
         try:
 
-            if self._bridge is None:
-                creds_path : str = os.path.join(self._app.creds_path, self.CREDS_FILE)
-                ip : str = self._config.get("ip", None)
-                self._bridge = Bridge(ip = ip, config_file_path = creds_path)
-
-            self._bridge.connect()
+            if self._converter is None:
+                self._connect()
             self._render(self.name)
-            self._converter = Converter()
 
             if self._images is None:
                 self._images = []
@@ -193,10 +156,6 @@ class HuePlugin(IPlugin):
                 except KeyError as ex:
                     pass
 
-            if self._thread is None or not self._thread.is_alive():
-                self._thread = threading.Thread(target = self._flush, daemon = True)
-                self._thread.start()
-
         except Exception as ex:
             self._log.error(ex)
             self._activated = False
@@ -205,12 +164,6 @@ class HuePlugin(IPlugin):
 
     def deactivate(self):
         super().deactivate()
-        try:
-            if self._thread:
-                self._thread.join()
-                self._thread = None
-        except:
-            pass
     
     def destroy(self):
         super().destroy()
@@ -227,16 +180,8 @@ class HuePlugin(IPlugin):
         self._reset_buffers()
 
     def _reset_buffers(self) -> None:
-        self._inc_buffer = {
-            "brightness": 0, 
-            "hue": 0, 
-            "saturation": 0,
-            "color": {
-                "red": 0, 
-                "green": 0,
-                "blue": 0
-            }
-        }
+        # turns not yet applied were meant for the previous modifier
+        self._app.dials.clear(self)
 
     def _update_buttons(self):
 
@@ -406,46 +351,31 @@ class HuePlugin(IPlugin):
             case 0:
                 match self._state:
                     case HuePlugin.State.GROUPS:
-                        self._group_index += sorted((-1, value, 1))[1]
+                        self._group_index += value
                         self._group_index = self._wrap(self._group_index, len(self.groups))
                         self._show_groups()
                     case HuePlugin.State.LIGHTS:
-                        self._light_index += sorted((-1, value, 1))[1]
+                        self._light_index += value
                         self._light_index = self._wrap(self._light_index, len(self.lights))
                         self._show_lights()
                     case HuePlugin.State.SCENES:
-                        self._scene_index += sorted((-1, value, 1))[1]
+                        self._scene_index += value
                         self._scene_index = self._wrap(self._scene_index, len(self.scenes))
                         self._show_scenes()
                     case _:
                         pass
             case _:
-                match self._modifier_state:
-                    case HuePlugin.ModifierState.COLOR:
-                        light : Light = self.lights[self._light_index]
-                        if not hasattr(light, "rgb"):
-                            return
-                        match dial:
-                            case 1:
-                                self._inc_buffer["color"]["red"] += value
-                            case 2:
-                                self._inc_buffer["color"]["green"] += value
-                            case 3:
-                                self._inc_buffer["color"]["blue"] += value
-                            case _:
-                                pass
-                    case HuePlugin.ModifierState.BRIGHTNESS:
-                        match dial:
-                            case 1:
-                                self._inc_buffer["brightness"] += value
-                            case 2:
-                                self._inc_buffer["hue"] += value
-                            case 3:
-                                self._inc_buffer["saturation"] += value
-                            case _:
-                                pass
-                    case _:
-                        pass
+                # the app has already summed these over DIAL_FRAME_INTERVALS
+                try:
+                    match self._modifier_state:
+                        case HuePlugin.ModifierState.COLOR:
+                            self._apply_color(dial, value)
+                        case HuePlugin.ModifierState.BRIGHTNESS:
+                            self._apply_levels(dial, value)
+                        case _:
+                            pass
+                except Exception as ex:
+                    self._log.error(ex)
 
     def on_dial_pushed(self, deck, dial, state):
         super().on_dial_pushed(deck, dial, state)
@@ -5,7 +5,6 @@ from collections import defaultdict
 from jellyfin_apiclient_python import JellyfinClient
 
 import textwrap
-import threading
 
 class JellyfinPlugin(IPlayer):
 
@@ -21,6 +20,26 @@ class JellyfinPlugin(IPlayer):
         self._track_counter = 0
         self._playlist_counter = -1
 
+    def _connect(self) -> None:
+        client : JellyfinClient = JellyfinClient()
+        client.config.app('streamdeck', '0.0.1', 'streamdeck', 'jellydeck')
+        client.config.data["auth.ssl"] = False
+        client.auth.connect_to_address(self._config["ip"])
+        response = client.auth.login(
+            self._config["ip"], 
+            self._config["username"], 
+            self._config["password"]
+        )
+        if response is None or response == {}:
+            raise Exception("Login failed")
+        self._client = client
+
+    def warm_up(self) -> None:
+        if not self._config["username"]:
+            return
+        if self._client is None:
+            self._connect()
+
     def activate(self) -> bool:
         if not super().activate(): 
             return False
@@ -32,19 +51,8 @@ class JellyfinPlugin(IPlayer):
 
             if self._client is None:
                 try:
-                    self._client = JellyfinClient()
-                    self._client.config.app('streamdeck', '0.0.1', 'streamdeck', 'jellydeck')
-                    self._client.config.data["auth.ssl"] = False
-                    self._client.auth.connect_to_address(self._config["ip"])
-                    response = self._client.auth.login(
-                        self._config["ip"], 
-                        self._config["username"], 
-                        self._config["password"]
-                    )
-                    if response is None or response == {}:
-                        raise Exception("Login failed")
+                    self._connect()
                 except Exception as ex:
-                    self._client = None
                     self._player_callback(VlcPlayerEvents.INFO_MESSAGE, {
                         "time": 2, 
                         "message": f"Couldn't connect to server\n{ex}", 
@@ -64,11 +72,7 @@ class JellyfinPlugin(IPlayer):
                 self._build_cache()
             self._restore_state()
 
-            if not self._running:
-                self._running = True
-                if self._thread is None:
-                    self._thread = threading.Thread(target = self._run)
-                    self._thread.start()
+            self._start_running()
 
             self._activated = True
 
@@ -165,7 +169,7 @@ class JellyfinPlugin(IPlayer):
                             self._log.debug(f"loading albums for : {artist.display_name}")
                             self._render(f"{artist.display_name}\n:- Loading albums...\n")
 
-                            artist.albums = self._get_albums_by_artist(artist)
+                            self._load_albums(artist)
                             self._log.info(f"Loaded {len(artist.albums)} albums")
 
                         size : int = len(artist.albums)
@@ -188,7 +192,7 @@ class JellyfinPlugin(IPlayer):
                                  :- Loading tracks..."""
                             )               
                             self._render(msg)
-                            album.tracks = self._get_tracks_by_album(album)
+                            self._load_tracks(album)
                             self._log.info(f"Loaded {len(album.tracks)} tracks")
 
                         self._track_counter = 0
@@ -1,8 +1,8 @@
 import textwrap
-import threading
-import time
 
 from ..IPlugin import IPlugin
+from services.periodic import PeriodicTask
+from services.timers import TimerHandle
 from enum import Enum
 from pyvesync import VeSync
 from pyvesync.vesyncfan import VeSyncAirBypass, Timer
@@ -70,26 +70,18 @@ class LevoitPlugin(IPlugin):
 		self._device : VeSyncAirBypass = None
 		self._state : State = State.NONE
 		self._images : list[bytes] = None
-		self._thread : threading.Thread = None
-		self._poll_counter : int = 0
-		self._notify_timer : threading.Timer = None
+		self._poll_task : PeriodicTask = None
+		self._notify_timer : TimerHandle = None
 		self._help_message = "Levoit Air Filter plugin\nBack | Speed | Sleep | Power\n Info | Timer | Bright | Sleep"
 
 	def _poll(self):
-
-		self._log.info(f"{self._class} :: poll thread started :: {self._activated}")
-		while self._activated:
-			self._poll_counter = self._poll_counter + 1
-			if self._poll_counter >= self.POLL_SPEED: 
-				# possible pull out to sync func for immediate atomic actions
-				if self._update_device():
-					self._update_state()
-			time.sleep(1)
-
-		self._log.info(f"{self._name} :: poll thread exiting")
+		if not self._activated:
+			return
+		# possible pull out to sync func for immediate atomic actions
+		if self._update_device():
+			self._update_state()
 
 	def _update_device(self) -> bool:
-		self._poll_counter = 0
 		self._log.debug("update device")
 		if self._client is not None:
 			self._client.update()
@@ -107,12 +99,13 @@ class LevoitPlugin(IPlugin):
 		self._update_state()
 
 	def _notify(self, message : str):
-		self._poll_counter = 0
+		# give the device a whole interval to settle before the next poll
+		if self._poll_task is not None:
+			self._poll_task.postpone()
 		self._render(message)
 		if self._notify_timer is not None:
 			self._notify_timer.cancel()
-		self._notify_timer = threading.Timer(5, self._update_screen_and_state)
-		self._notify_timer.start()
+		self._notify_timer = self._app.timers.call_later(5, self._update_screen_and_state)
 
 	def activate(self) -> bool:
 		if not super().activate(): 
@@ -122,31 +115,19 @@ class LevoitPlugin(IPlugin):
 			self._activated = True
 			self._render(self.name)
 
-			if self._client is None:
-				self._log.debug(f"{self._class} :: creating client")
-				self._client = VeSync(
-					self._config["username"], 
-					self._config["password"], 
-					self._config["timezone"]
-				)
-				if self._client.login():
-					self._log.debug(f"{self._class} :: client created")
-				else:
-					self._log.error("Couldn't login to VeSync")
-					self._notify("Couldn't login to VeSync")
-					self._client = None
-					self._activated = False
-					return False
+			if self._client is None and not self._login():
+				self._log.error("Couldn't login to VeSync")
+				self._notify("Couldn't login to VeSync")
+				self._activated = False
+				return False
 
 			if self._images is None:
 				self._images = []
 				self._load_images(self._images, LevoitPlugin.image_keys)
 
 			self._state = State.NONE
-			self._poll_counter = self.POLL_SPEED
-			if self._thread is None:
-				self._thread = threading.Thread(target = self._poll)
-				self._thread.start()
+			if self._poll_task is None:
+				self._poll_task = self._app.tasks.every(self.POLL_SPEED, self._poll, f"{self._class}.poll", jitter = 2.0, initial_delay = 0)
 
 		except Exception as ex:
 			self._log.error(ex)
@@ -156,9 +137,9 @@ class LevoitPlugin(IPlugin):
 
 	def deactivate(self):
 		super().deactivate()
-		if self._thread is not None:
-			self._thread.join()
-			self._thread = None
+		if self._poll_task is not None:
+			self._poll_task.cancel(wait = True)
+			self._poll_task = None
     
 	def destroy(self):
 		super().destroy()
@@ -168,6 +149,23 @@ class LevoitPlugin(IPlugin):
 	def run_as_daemon(self) -> None:
 		pass
 
+	def warm_up(self) -> None:
+		if self._client is None:
+			self._login()
+
+	def _login(self) -> bool:
+		self._log.debug(f"{self._class} :: creating client")
+		client : VeSync = VeSync(
+			self._config["username"], 
+			self._config["password"], 
+			self._config["timezone"]
+		)
+		if not client.login():
+			return False
+		self._log.debug(f"{self._class} :: client created")
+		self._client = client
+		return True
+
 	def on_button_press(self, deck, key, key_state):
 		super().on_button_press(deck, key, key_state)
 
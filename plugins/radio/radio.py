@@ -1,8 +1,8 @@
 from ..IPlugin import IPlugin
+from services.periodic import PeriodicTask
+from services.timers import TimerHandle
 from ..shared.player.vlc_player import VlcPlayer, VlcPlayerEvents, Track
 from enum import IntEnum, auto
-import threading
-import time
 
 class RadioPlugin(IPlugin):
 
@@ -54,8 +54,8 @@ class RadioPlugin(IPlugin):
         self._info_callback_lock = False
         self._bookmark_counter : int = 0
         self._running : bool = False
-        self._thread : threading.Thread = None
-        self._notify_timer : threading.Timer = None
+        self._now_playing_task : PeriodicTask = None
+        self._notify_timer : TimerHandle = None
         self._player : VlcPlayer = VlcPlayer(app, self._on_player_callback)
 
         self._help_message = "Internet Radio plugin\nBack | Chan 1 | Chan 2 | Chan 3\nChan - | Stop | Play | Chan +"
@@ -91,9 +91,8 @@ class RadioPlugin(IPlugin):
 
             self._running = True
 
-            if self._thread is None:
-                self._thread = threading.Thread(target = self._main_loop)
-                self._thread.start()
+            if self._now_playing_task is None:
+                self._now_playing_task = self._app.tasks.every(16.0, self._player.show_now_playing, f"{self._class}.now_playing")
 
         except Exception as ex:
             self._log.error(ex)
@@ -101,25 +100,14 @@ class RadioPlugin(IPlugin):
 
         return self._activated
 
-    def _main_loop(self) -> None:
-        self._log.info("Main loop starting")
-        counter : int = 0
-        while self._running:
-            counter += 1
-            if counter > 15:
-                counter = 0
-                self._player.show_now_playing()
-            time.sleep(1.0)
-        self._log.info("Main loop exiting")
-
     def _stop_everything(self) -> None:
         try:
             self._running = False
             self._player.stop()
             self._player.clear()
-            if self._thread is not None:
-                self._thread.join()
-                self._thread = None
+            if self._now_playing_task is not None:
+                self._now_playing_task.cancel(wait = True)
+                self._now_playing_task = None
         except:
             pass
 
@@ -169,7 +157,6 @@ class RadioPlugin(IPlugin):
                 num_bookmarks : int = len(self._bookmarks)
                 if num_bookmarks == 0:
                     return
-                value = sorted((-1, value, 1))[1]
                 self._bookmark_counter = self._wrap(self._bookmark_counter + value, num_bookmarks)
                 name : str = self._bookmarks[self._bookmark_counter].get("name", "Unknown")
                 msg : str = f"{name} [{self._bookmark_counter + 1}/{num_bookmarks}]"
@@ -224,8 +211,7 @@ class RadioPlugin(IPlugin):
                     # restore our original state
                     if self._notify_timer is not None:
                         self._notify_timer.cancel()
-                    self._notify_timer = threading.Timer(time, self._restore_state)
-                    self._notify_timer.start()
+                    self._notify_timer = self._app.timers.call_later(time, self._restore_state)
                 else:
                     self._info_callback_lock = False
             except:
@@ -1,9 +1,9 @@
 from ..IPlugin import IPlugin
+from services.timers import TimerHandle
 from enum import IntEnum
 import os
 import subprocess
 import sys
-import threading
 
 class SettingsPlugin(IPlugin):
 
@@ -30,7 +30,7 @@ class SettingsPlugin(IPlugin):
 	def __init__(self, app, config, font) -> None:
 		super().__init__(app, config, font)
 		self._images : list[bytes] = None
-		self._notify_timer : threading.Timer = None
+		self._notify_timer : TimerHandle = None
 		self._help_message = "Settings plugin\nBack | Update | Reboot | Off\nInfo | Restart | Save | Wifi"
 
 	def activate(self) -> bool:
@@ -179,5 +179,4 @@ class SettingsPlugin(IPlugin):
 		if not keep:
 			if self._notify_timer is not None:
 				self._notify_timer.cancel()
-			self._notify_timer = threading.Timer(5.0, self._update_state)
-			self._notify_timer.start()
+			self._notify_timer = self._app.timers.call_later(5.0, self._update_state)
@@ -1,3 +1,4 @@
 from .vlc_player import VlcPlayer, VlcPlayerEvents
 from .types import Artist, Album, Track
+from .advancer import PlaybackAdvancer
 from .iplayer import IPlayer
\ No newline at end of file
@@ -0,0 +1,75 @@
+from .vlc_player import VlcPlayer
+
+import logging
+import os
+import threading
+
+class PlaybackAdvancer():
+    """
+    Moves the player on to the next track when the current one ends.
+    VLC must not be called back into from its own event thread, so the end of media event only
+    signals this, and a thread which sleeps on a condition until then does the play.
+    Nothing wakes up while music is playing or the player is idle.
+    """
+
+    def __init__(self, player : VlcPlayer, name : str = "player") -> None:
+        self._player : VlcPlayer = player
+        self._name : str = name
+        self._condition : threading.Condition = threading.Condition()
+        self._pending : bool = False
+        self._running : bool = False
+        self._thread : threading.Thread = None
+        self._advanced : int = 0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def advanced(self) -> int:
+        return self._advanced
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._pending = False
+        self._thread = threading.Thread(target = self._run, name = f"{self._name}-advancer", daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def media_ended(self) -> None:
+        """
+        Called from the player's end of media event.
+        """
+        with self._condition:
+            self._pending = True
+            self._condition.notify()
+
+    def _run(self) -> None:
+        self._log.info(f"{self._name} advancer starting")
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                self._pending = False
+            try:
+                if len(self._player.playlist) > 0:
+                    self._log.debug("Playlist has songs to play")
+                    self._player.play()
+                    self._advanced += 1
+            except Exception as ex:
+                self._log.error(f"Error playing the next song : {ex}")
+        self._log.info(f"{self._name} advancer exiting")
@@ -1,14 +1,17 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from enum import auto, IntEnum
 from ...IPlugin import IPlugin
+from services.timers import TimerHandle
+from .advancer import PlaybackAdvancer
+from .prefetcher import Prefetcher
 from .types import Artist, Album, Track
 from .vlc_player import VlcPlayer, VlcPlayerEvents
 
 import logging
 import os
 import textwrap
-import threading
-import time
 
 class IPlayer(IPlugin):
 
@@ -54,6 +57,13 @@ class IPlayer(IPlugin):
 
     image_keys = [ "artist.png", "album.png", "track.png", "loop-on.png", "loop-off.png", "shuffle.png", "add.png", "stop.png", "play.png", "playing.png", "paused.png", "next.png" ]
 
+    # browsing artists, albums and tracks speeds up with the spin
+    ACCELERATED_DIALS : frozenset[int] = frozenset({ 0 })
+    # artists or albums either side of the cursor whose albums or tracks are loaded in the background
+    PREFETCH_RADIUS : int = 2
+    # albums whose tracks are loaded at once when enqueuing many
+    ENQUEUE_WORKERS : int = 8
+
     def __init__(self, app, config, font) -> None:
         super().__init__(app, config, font)
 
@@ -63,16 +73,21 @@ class IPlayer(IPlugin):
         self._images : list[bytes] = None
         self._info_latch : bool = True
         self._info_callback_lock : bool = False
-        self._thread : threading.Thread = None
         self._running : bool = False
-        self._play_next : bool = False
-        self._notify_timer : threading.Timer = None
+        self._notify_timer : TimerHandle = None
         self._log : logging.Logger = logging.getLogger(__name__)
         self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
         self._player = VlcPlayer(
             app, 
             self._player_callback
         )
+        self._advancer : PlaybackAdvancer = PlaybackAdvancer(self._player, self._class)
+        self._prefetch_radius : int = max(0, int(self._config.get("prefetch_radius", IPlayer.PREFETCH_RADIUS)))
+        self._prefetcher : Prefetcher = Prefetcher(
+            self._class,
+            int(self._config.get("prefetch_workers", Prefetcher.DEFAULT_MAX_WORKERS))
+        )
+        self._enqueue_workers : int = max(1, int(self._config.get("enqueue_workers", IPlayer.ENQUEUE_WORKERS)))
 
         # create and pre allocate the partitions
         self._partition_counter : int = 0
@@ -92,16 +107,22 @@ class IPlayer(IPlugin):
 
     def deactivate(self) -> None:
         super().deactivate()
+        self._prefetcher.cancel()
         if not self._player.playing and not self._player.paused:
             self._stop_everything()
 
     def destroy(self) -> None:
         super().destroy()
+        self._prefetcher.stop()
         self._stop_everything()
 
     def run_as_daemon(self) -> None:
         pass
 
+    @property
+    def prefetch_stats(self) -> dict:
+        return self._prefetcher.stats
+
     @property
     def idle(self) -> bool:
         return self._player.idle
@@ -133,8 +154,8 @@ class IPlayer(IPlugin):
             case VlcPlayerEvents.STOPPED_MEDIA:
                 self._update_buttons()
             case VlcPlayerEvents.MEDIA_ENDED:
-                self._log.debug("Setting play_next to true")
-                self._play_next = True
+                self._log.debug("Media ended, advancing")
+                self._advancer.media_ended()
                 self._update_buttons()
             case VlcPlayerEvents.INFO_MESSAGE:
                 try:
@@ -146,8 +167,7 @@ class IPlayer(IPlugin):
                         # restore our original state
                         if self._notify_timer is not None:
                             self._notify_timer.cancel()
-                        self._notify_timer = threading.Timer(time, self._restore_state)
-                        self._notify_timer.start()
+                        self._notify_timer = self._app.timers.call_later(time, self._restore_state)
                     else:
                         self._info_callback_lock = False
                 except:
@@ -162,7 +182,8 @@ class IPlayer(IPlugin):
             case 0:
                 match self._state:
                     case IPlayer.State.PARTITIONS:
-                        self._partition_counter += sorted((-1, value, 1))[1]
+                        # the app sums a frame's detents, so step by all of them
+                        self._partition_counter += value
                         size : int = len(self._partition_keys)
                         if size > 0:
                             self._partition_counter = self._wrap(self._partition_counter, size)
@@ -197,11 +218,12 @@ class IPlayer(IPlugin):
                     case _:
                         return
             case 1:
-                value : int = sorted((-1, value, 1))[1]
-                new_state : int = self._toggle_state + value
-                new_state = self._wrap(new_state, len(IPlayer.ToggleState))
-                if 0 == new_state:
-                    new_state = 1 if value == 1 else len(IPlayer.ToggleState) - 1
+                # step through the toggles, skipping NONE, which sits just before the first and after the last
+                num_toggles : int = len(IPlayer.ToggleState) - 1
+                position : int = self._toggle_state
+                if IPlayer.ToggleState.NONE == self._toggle_state and value < 0:
+                    position = num_toggles + 1
+                new_state : int = self._wrap(position + value - 1, num_toggles) + 1
                 self._toggle_state = IPlayer.ToggleState(new_state)
                 self._show_toggle_state()
                 return
@@ -211,7 +233,6 @@ class IPlayer(IPlugin):
                 if self._playlist_counter < 0:                
                     self._playlist_counter = 0
                 else:
-                    value : int = sorted((-1, value, 1))[1]
                     self._playlist_counter += value
                 self._playlist_counter = self._wrap(
                     self._playlist_counter, 
@@ -220,6 +241,7 @@ class IPlayer(IPlugin):
                 self._show_playlist()
             case 3:
                 self._player.volume = max(min(100, self._player.volume + value), 0)
+                self._render_zone(3, f"Volume\n{self._player.volume}%")
             case _:
                 return
 
@@ -229,23 +251,14 @@ class IPlayer(IPlugin):
             self._player.stop()
             self._player.clear()
             self._player.destroy()
-            if self._thread is not None:
-                self._thread.join()
-                self._thread = None
+            self._advancer.stop()
         except:
             pass
 
-    def _run(self) -> None:
-        self._log.info(f"{self._class} thread starting")
-        while (self._running):
-            time.sleep(0.1)
-            if self._play_next:
-                self._log.debug("Preparing to play the next song")
-                self._play_next = False
-                if len(self._player.playlist) > 0:
-                    self._log.debug("Playlist has songs to play")
-                    self._player.play()
-        self._log.info(f"{self._class} thread exiting")
+    def _start_running(self) -> None:
+        if not self._running:
+            self._running = True
+            self._advancer.start()
 
     def _restore_state(self) -> None:
         if not self._activated: return
@@ -325,6 +338,7 @@ class IPlayer(IPlugin):
 
             self._log.debug(f"show_artist :: {artist.display_name}")
             self._render(f"{artist.display_name}\n\n")
+            self._prefetch_albums()
         except:
             pass
 
@@ -342,10 +356,70 @@ class IPlayer(IPlugin):
                 """
             )
             self._render(msg)
+            self._prefetch_tracks()
         except Exception as ex:
             self._log.error(ex)
             pass
 
+    def _neighbours(self, items : list, index : int) -> list:
+        """
+        The items within the prefetch radius of index, nearest first, wrapping as the dial does.
+        """
+        size : int = len(items)
+        offsets : list[int] = [ 0 ]
+        for distance in range(1, self._prefetch_radius + 1):
+            offsets += [ distance, -distance ]
+        indexes : list[int] = []
+        for offset in offsets:
+            wrapped : int = self._wrap(index + offset, size)
+            if wrapped not in indexes:
+                indexes.append(wrapped)
+        return [ items[i] for i in indexes ]
+
+    def _prefetch_albums(self) -> None:
+        if self._prefetch_radius == 0:
+            return
+        partition : list[Artist] = self._artists[self._partition_keys[self._partition_counter]]
+        self._prefetcher.want([
+            (("albums", artist.id), lambda artist = artist: self._fetch_albums(artist))
+            for artist in self._neighbours(partition, self._artist_counter)
+            if len(artist.albums) == 0
+        ])
+
+    def _prefetch_tracks(self) -> None:
+        if self._prefetch_radius == 0:
+            return
+        artist : Artist = self._artists[self._partition_keys[self._partition_counter]][self._artist_counter]
+        self._prefetcher.want([
+            (("tracks", album.id), lambda album = album: self._fetch_tracks(album))
+            for album in self._neighbours(artist.albums, self._album_counter)
+            if len(album.tracks) == 0
+        ])
+
+    def _load_albums(self, artist : Artist) -> list[Album]:
+        """
+        The artist's albums, joining a prefetch of them if there is one under way.
+        """
+        self._prefetcher.join(("albums", artist.id))
+        return self._fetch_albums(artist)
+
+    def _load_tracks(self, album : Album) -> list[Track]:
+        """
+        The album's tracks, joining a prefetch of them if there is one under way.
+        """
+        self._prefetcher.join(("tracks", album.id))
+        return self._fetch_tracks(album)
+
+    def _fetch_albums(self, artist : Artist) -> list[Album]:
+        if len(artist.albums) == 0:
+            artist.albums = self._get_albums_by_artist(artist)
+        return artist.albums
+
+    def _fetch_tracks(self, album : Album) -> list[Track]:
+        if len(album.tracks) == 0:
+            album.tracks = self._get_tracks_by_album(album)
+        return album.tracks
+
     def _show_track(self) -> None:
         try:
             self._state = IPlayer.State.TRACKS
@@ -413,10 +487,7 @@ class IPlayer(IPlugin):
             self._last_enqueued_album = None
             return
         try:
-            tracks = self._get_tracks_by_album(album)
-            for track in tracks:
-                if not track.url:
-                    track.url = self._get_stream_for_track(track)
+            tracks = self._streamable_tracks(album)
             self._player.enqueue_album(album.display_name, tracks)
             self._last_enqueued_album = album
         except Exception as ex:
@@ -427,9 +498,45 @@ class IPlayer(IPlugin):
             self._last_enqueued_artist = None
             return
         try:
-            albums = self._get_albums_by_artist(artist)
-            for album in albums:
-                self._enqueue_album(album)
+            albums = self._load_albums(artist)
+            self._enqueue_albums(albums, f"Added {len(albums)} albums\nby {artist.display_name}")
             self._last_enqueued_artist = artist
         except Exception as ex:
             self._log.error(ex)
+
+    def _enqueue_albums(self, albums : list[Album], message : str) -> None:
+        """
+        Enqueues every track of each album, in the albums' order.
+        """
+        tracks : list[list[Track]] = self._tracks_for_albums(albums)
+        self._player.enqueue_albums([ (album.display_name, t) for album, t in zip(albums, tracks) ], message)
+
+    def _tracks_for_albums(self, albums : list[Album], with_urls : bool = True) -> list[list[Track]]:
+        """
+        The tracks of each album, with their stream urls unless with_urls is False, in the albums' order.
+        Up to enqueue_workers albums load at once, so many albums cost a round trip or two rather than one each.
+        """
+        load : Callable[[Album], list[Track]] = self._streamable_tracks if with_urls else self._safe_load_tracks
+        if len(albums) <= 1:
+            return [ load(album) for album in albums ]
+        workers : int = min(self._enqueue_workers, len(albums))
+        with ThreadPoolExecutor(max_workers = workers, thread_name_prefix = f"{self._class}-enqueue") as executor:
+            return list(executor.map(load, albums))
+
+    def _safe_load_tracks(self, album : Album) -> list[Track]:
+        try:
+            return self._load_tracks(album)
+        except Exception as ex:
+            self._log.error(f"Couldn't load the tracks of {album.display_name} : {ex}")
+            return []
+
+    def _streamable_tracks(self, album : Album) -> list[Track]:
+        tracks : list[Track] = self._safe_load_tracks(album)
+        try:
+            for track in tracks:
+                if not track.url:
+                    track.url = self._get_stream_for_track(track)
+            return tracks
+        except Exception as ex:
+            self._log.error(f"Couldn't get the streams for {album.display_name} : {ex}")
+            return []
@@ -0,0 +1,99 @@
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Hashable
+
+import logging
+import os
+import threading
+
+class Prefetcher():
+    """
+    Loads what the user is likely to push into next, the albums of the artists either side of the cursor,
+    or the tracks of the albums either side, on a few background threads.
+    Each call to want() replaces the wanted set, anything still queued that is no longer wanted is cancelled,
+    a load already under way runs to the end, as the request can't be taken back, and its result is kept.
+    """
+
+    DEFAULT_MAX_WORKERS : int = 2
+
+    def __init__(self, name : str, max_workers : int = DEFAULT_MAX_WORKERS) -> None:
+        self._name : str = name
+        self._max_workers : int = max(1, max_workers)
+        self._executor : ThreadPoolExecutor = None
+        self._futures : dict[Hashable, Future] = {}
+        self._lock : threading.Lock = threading.Lock()
+        self._submitted : int = 0
+        self._cancelled : int = 0
+        self._failed : int = 0
+        self._joined : int = 0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def stats(self) -> dict:
+        # want, join and cancel change the futures on other threads
+        with self._lock:
+            futures : list[Future] = list(self._futures.values())
+        return {
+            "submitted": self._submitted,
+            "cancelled": self._cancelled,
+            "failed": self._failed,
+            "joined": self._joined,
+            "in_flight": sum(1 for f in futures if not f.done())
+        }
+
+    def want(self, jobs : list[tuple[Hashable, Callable[[], None]]]) -> None:
+        """
+        jobs are (key, load), nearest the cursor first, a key already loading or loaded isn't loaded again.
+        """
+        with self._lock:
+            wanted : set[Hashable] = { key for key, _ in jobs }
+            for key in [ k for k in self._futures if k not in wanted ]:
+                if self._futures.pop(key).cancel():
+                    self._cancelled += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers = self._max_workers, thread_name_prefix = f"{self._name}-prefetch")
+            for key, load in jobs:
+                future : Future = self._futures.get(key)
+                if future is not None and not future.cancelled():
+                    continue
+                self._futures[key] = self._executor.submit(self._run, key, load)
+                self._submitted += 1
+
+    def join(self, key : Hashable) -> None:
+        """
+        Before loading key in the foreground, waits for a prefetch of it which has already started.
+        One still queued is cancelled instead, the caller is about to load it straight away.
+        """
+        with self._lock:
+            future : Future = self._futures.pop(key, None)
+            if future is None:
+                return
+            if future.cancel():
+                self._cancelled += 1
+                return
+            self._joined += 1
+        try:
+            future.result()
+        except (CancelledError, Exception):
+            pass
+
+    def cancel(self) -> None:
+        with self._lock:
+            for future in self._futures.values():
+                if future.cancel():
+                    self._cancelled += 1
+            self._futures.clear()
+
+    def stop(self) -> None:
+        self.cancel()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait = False, cancel_futures = True)
+                self._executor = None
+
+    def _run(self, key : Hashable, load : Callable[[], None]) -> None:
+        try:
+            load()
+        except Exception as ex:
+            self._failed += 1
+            self._log.warning(f"Prefetch of {key} failed : {ex}")
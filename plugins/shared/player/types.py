@@ -47,12 +47,13 @@ class Album():
 
     key : str = "MusicAlbum"
 
-    def __init__(self, id : str, name : str, artist: str, year : int = 0) -> None:
+    def __init__(self, id : str, name : str, artist: str, year : int = 0, cover_id : str = "") -> None:
         self._id : str = id
         self._name : str = name
         self._artist_name: str = artist
         self._tracks : list[Track] = []
         self._year : int = year
+        self._cover_id : str = cover_id
 
     def __lt__(self, other):
         return isinstance(other, Album) and self.display_name < other.display_name
@@ -85,6 +86,10 @@ class Album():
     def year(self):
         return self._year
 
+    @property
+    def cover_id(self):
+        return self._cover_id
+
     @property
     def display_name(self):
         return string.capwords(self._name.replace("_", " "))
@@ -101,7 +106,7 @@ class Track():
 
     key : str = "Audio"
 
-    def __init__(self, id : str, name : str, album : str, artist : str, index : int = 0, url : str = "") -> None:
+    def __init__(self, id : str, name : str, album : str, artist : str, index : int = 0, url : str = "", cover_id : str = "") -> None:
         self._id : str = id
         self._name : str = name
         self._display_name : str = string.capwords(name.replace("_", " "))
@@ -109,6 +114,7 @@ class Track():
         self._album_name : str = album
         self._index : int = index
         self._url : str = url
+        self._cover_id : str = cover_id
 
     def __lt__(self, other):
         return isinstance(other, Track) and self.index < other.index
@@ -155,6 +161,10 @@ class Track():
     def url(self, value : str):
         self._url = value
 
+    @property
+    def cover_id(self):
+        return self._cover_id
+
     @property
     def display_name(self):
         return self._display_name
@@ -1,5 +1,5 @@
 from enum import Enum
-from threading import Thread
+from services.periodic import PeriodicTask
 from typing import final
 from vlc import MediaPlayer, EventManager, EventType, Instance, Media
 from vlc import State, Meta, MediaParseFlag
@@ -8,7 +8,6 @@ from .types import Track
 import logging
 import os
 import random
-import time
 
 @final
 class VlcPlayerEvents(Enum):
@@ -23,6 +22,9 @@ class VlcPlayerEvents(Enum):
 
 class VlcPlayer:
 
+    NOW_PLAYING_INTERVAL : float = 26.0
+    NOW_PLAYING_DETAILS_INTERVAL : float = 11.0
+
     def __init__(self, app, player_callback) -> None:
         self._app = app
         self._instance : Instance = Instance('')
@@ -35,12 +37,13 @@ class VlcPlayer:
         self._rotation_counter : int = 0
         self._loop : bool = False
         self._player_callback = player_callback
-        self._thread_running : bool = False
-        self._thread: Thread = Thread(target = self._now_playing_thread_looper)
-        self._thread.daemon = True
-        self._thread.start()
         self._log : logging.Logger = logging.getLogger(__name__)
         self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+        self._now_playing_task : PeriodicTask = app.tasks.every(
+            VlcPlayer.NOW_PLAYING_INTERVAL,
+            self._now_playing_tick,
+            "VlcPlayer.now_playing"
+        )
     
     # properties
     @property
@@ -229,17 +232,12 @@ class VlcPlayer:
             self._reset()
             return None
 
-    def _now_playing_thread_looper(self) -> None:
-        if self._thread_running: return
-        self._thread_running = True
-        counter : int = 0
-        while self._thread_running:
-            time.sleep(1)
-            counter += 1
-            if counter > 25:
-                counter = 0 if self._rotation_counter == 0 else 15
-                if self.playing:
-                    self.show_now_playing()
+    def _now_playing_tick(self) -> None:
+        # the details page gets a shorter turn than the title
+        if self._rotation_counter != 0:
+            self._now_playing_task.reschedule(VlcPlayer.NOW_PLAYING_DETAILS_INTERVAL)
+        if self.playing:
+            self.show_now_playing()
 
     def clear_now_playing(self) -> None:
         if self._now_playing is not None:
@@ -342,6 +340,18 @@ class VlcPlayer:
             self._rotation_counter = 0
 
     def enqueue(self, track : Track) -> None:
+        self._insert(track)
+        self._info_callback("Added", 0.5, False)
+
+    def enqueue_tracks(self, tracks : list[Track], message : str) -> None:
+        """
+        Adds each track as enqueue does, with a single message for the lot.
+        """
+        for track in tracks:
+            self._insert(track)
+        self._info_callback(message, 2, False)
+
+    def _insert(self, track : Track) -> None:
         if self.loop and self._now_playing is not None:
             try:
                 index : int = max(0, self.playlist.index(self._now_playing))
@@ -352,13 +362,21 @@ class VlcPlayer:
             self.playlist.append(track)
         self._log.debug(f"Added track {track.display_name} - ({track.index})")
         self._log.debug(f"Playlist size : {len(self.playlist)}")
-        self._info_callback("Added", 0.5, False)
 
     def enqueue_album(self, name : str, tracks : list[Track]) -> None:
         self.playlist.extend(tracks)
         self._log.debug(f"Added {len(tracks)} tracks to playlist")
         self._info_callback(f"Added album {name}", 0.5, False)
 
+    def enqueue_albums(self, albums : list[tuple[str, list[Track]]], message : str) -> None:
+        """
+        Adds several albums in order, with a single message for the lot rather than one per album.
+        """
+        for name, tracks in albums:
+            self.playlist.extend(tracks)
+            self._log.debug(f"Added {len(tracks)} tracks from {name} to playlist")
+        self._info_callback(message, 2, False)
+
     def shuffle(self) -> None:
         random.shuffle(self.playlist)
         self._info_callback("List shuffled", 0.5, False)
@@ -412,7 +430,6 @@ class VlcPlayer:
         self._log.debug(f"Mute set to {self._player.audio_get_mute()}")
 
     def destroy(self) -> None:
-        if self._thread is not None:
-            self._thread_running = False
-            self._thread.join()
-            self._thread = None
+        if self._now_playing_task is not None:
+            self._now_playing_task.cancel(wait = True)
+            self._now_playing_task = None
@@ -0,0 +1,199 @@
+from collections import defaultdict
+from typing import Optional
+from ..shared.player.types import Artist, Album, Track
+
+import logging
+import os
+import sqlite3
+import threading
+
+class LibraryIndex():
+    """
+    The server's artists, albums and tracks kept in a SQLite file, so browsing survives a restart without going back to the server.
+    Artists are replaced wholesale when the server says the library changed, albums and tracks are stored as they are first fetched.
+    After a change every artist's albums are fetched again on the next browse, dropping the tracks of any album whose song count moved,
+    and an artist whose album count changed loses its albums straight away.
+    """
+
+    SCHEMA_VERSION : int = 1
+
+    def __init__(self, path : str, server : str) -> None:
+        self._path : str = path
+        self._lock : threading.Lock = threading.Lock()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+        self._db : sqlite3.Connection = sqlite3.connect(path, check_same_thread = False)
+        self._create()
+        if self._get_meta("server") != server or self._get_meta("schema") != str(LibraryIndex.SCHEMA_VERSION):
+            self._log.info(f"Starting a new library index in {path}")
+            self.clear()
+            self._set_meta("server", server)
+            self._set_meta("schema", str(LibraryIndex.SCHEMA_VERSION))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def last_modified(self) -> float:
+        """
+        The server's lastModified for the artists held, in seconds as libsonic hands it over, 0 when there are none.
+        """
+        return float(self._get_meta("last_modified") or 0)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            counts : list[int] = [
+                self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("artists", "albums", "tracks")
+            ]
+        return {
+            "artists": counts[0],
+            "albums": counts[1],
+            "tracks": counts[2],
+            "last_modified": self.last_modified
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            for table in ("tracks", "albums", "artists"):
+                self._db.execute(f"DELETE FROM {table}")
+            self._db.execute("DELETE FROM meta WHERE key = 'last_modified'")
+
+    def artists(self, partition_keys : list[str]) -> defaultdict[str, list[Artist]]:
+        partitions : defaultdict[str, list[Artist]] = defaultdict(list)
+        for key in partition_keys:
+            partitions[key] = []
+        with self._lock:
+            rows = self._db.execute("SELECT id, name, partition_key FROM artists ORDER BY position").fetchall()
+        for id, name, partition_key in rows:
+            if partition_key in partitions:
+                partitions[partition_key].append(Artist(id, name))
+        return partitions
+
+    def replace_artists(self, artists : list[tuple[str, str, str, int]], last_modified : float) -> None:
+        """
+        artists are (id, name, partition key, album count), in the server's order.
+        Albums are kept, but marked to be checked against the server again, unless the artist's album count changed.
+        """
+        with self._lock, self._db:
+            known : dict[str, int] = dict(self._db.execute("SELECT id, album_count FROM artists").fetchall())
+            incoming : set[str] = { a[0] for a in artists }
+            stale : list[str] = [ id for id in known if id not in incoming ]
+            stale += [ id for id, _, _, count in artists if id in known and known[id] != count ]
+            for id in stale:
+                self._drop_albums(id)
+            self._db.execute("DELETE FROM artists")
+            # albums_fetched starts at 0, so the next browse goes through store_albums and its song count check
+            self._db.executemany(
+                "INSERT INTO artists (id, name, partition_key, album_count, position) VALUES (?, ?, ?, ?, ?)",
+                [ (id, name, key, count, position) for position, (id, name, key, count) in enumerate(artists) ]
+            )
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_modified', ?)", (str(last_modified), ))
+        if stale:
+            self._log.info(f"Dropped the albums of {len(stale)} changed artists")
+
+    def albums(self, artist_id : str) -> Optional[list[Album]]:
+        """
+        None when the artist's albums haven't been fetched yet.
+        """
+        with self._lock:
+            fetched = self._db.execute("SELECT albums_fetched FROM artists WHERE id = ?", (artist_id, )).fetchone()
+            if fetched is None or not fetched[0]:
+                return None
+            rows = self._db.execute(
+                "SELECT id, name, artist_name, year, cover_id FROM albums WHERE artist_id = ? ORDER BY position",
+                (artist_id, )
+            ).fetchall()
+        return [ Album(id, name, artist_name, year, cover_id) for id, name, artist_name, year, cover_id in rows ]
+
+    def store_albums(self, artist_id : str, albums : list[tuple[Album, int]]) -> None:
+        """
+        albums are (album, song count), in display order. Drops the tracks of any album whose song count changed.
+        """
+        with self._lock, self._db:
+            counts : dict[str, int] = { a.id: count for a, count in albums }
+            fetched : set[str] = set()
+            for id, in self._db.execute("SELECT id FROM albums WHERE artist_id = ?", (artist_id, )).fetchall():
+                if id not in counts:
+                    self._db.execute("DELETE FROM tracks WHERE album_id = ?", (id, ))
+            for id, count in counts.items():
+                row = self._db.execute("SELECT song_count, tracks_fetched FROM albums WHERE id = ?", (id, )).fetchone()
+                if row is None:
+                    continue
+                if row[0] == count and row[1]:
+                    fetched.add(id)
+                else:
+                    self._db.execute("DELETE FROM tracks WHERE album_id = ?", (id, ))
+            self._db.execute("DELETE FROM albums WHERE artist_id = ?", (artist_id, ))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO albums (id, artist_id, name, artist_name, year, cover_id, song_count, tracks_fetched, position) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [ (a.id, artist_id, a.name, a.artist_name, a.year, a.cover_id, count, a.id in fetched, position) for position, (a, count) in enumerate(albums) ]
+            )
+            self._db.execute("UPDATE artists SET albums_fetched = 1 WHERE id = ?", (artist_id, ))
+
+    def tracks(self, album_id : str) -> Optional[list[Track]]:
+        """
+        None when the album's tracks haven't been fetched yet.
+        """
+        with self._lock:
+            fetched = self._db.execute("SELECT tracks_fetched FROM albums WHERE id = ?", (album_id, )).fetchone()
+            if fetched is None or not fetched[0]:
+                return None
+            rows = self._db.execute(
+                "SELECT id, name, album_name, artist_name, track_index, cover_id FROM tracks WHERE album_id = ? ORDER BY position",
+                (album_id, )
+            ).fetchall()
+        return [ Track(id, name, album_name, artist_name, index, cover_id = cover_id) for id, name, album_name, artist_name, index, cover_id in rows ]
+
+    def store_tracks(self, album : Album, tracks : list[Track]) -> None:
+        """
+        Only kept for albums already stored under an artist, the latest or random ones would pile up with nothing to clear them.
+        """
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM albums WHERE id = ?", (album.id, )).fetchone() is None:
+                return
+            self._db.execute("DELETE FROM tracks WHERE album_id = ?", (album.id, ))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tracks (id, album_id, name, album_name, artist_name, track_index, cover_id, position) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [ (t.id, album.id, t.name, t.album_name, t.artist_name, t.index, t.cover_id, position) for position, t in enumerate(tracks) ]
+            )
+            self._db.execute("UPDATE albums SET tracks_fetched = 1 WHERE id = ?", (album.id, ))
+
+    def _drop_albums(self, artist_id : str) -> None:
+        self._db.execute("DELETE FROM tracks WHERE album_id IN (SELECT id FROM albums WHERE artist_id = ?)", (artist_id, ))
+        self._db.execute("DELETE FROM albums WHERE artist_id = ?", (artist_id, ))
+
+    def _get_meta(self, key : str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key, )).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key : str, value : str) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _create(self) -> None:
+        with self._lock, self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS artists (
+                    id TEXT PRIMARY KEY, name TEXT, partition_key TEXT, album_count INTEGER,
+                    albums_fetched INTEGER DEFAULT 0, position INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS albums (
+                    id TEXT PRIMARY KEY, artist_id TEXT, name TEXT, artist_name TEXT, year INTEGER, cover_id TEXT,
+                    song_count INTEGER, tracks_fetched INTEGER DEFAULT 0, position INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS tracks (
+                    id TEXT, album_id TEXT, name TEXT, album_name TEXT, artist_name TEXT, track_index INTEGER, cover_id TEXT,
+                    position INTEGER, PRIMARY KEY (album_id, id)
+                );
+                CREATE INDEX IF NOT EXISTS albums_by_artist ON albums (artist_id, position);
+                CREATE INDEX IF NOT EXISTS tracks_by_album ON tracks (album_id, position);
+            """)
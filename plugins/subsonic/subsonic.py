@@ -4,11 +4,12 @@ from urllib.parse import urlencode
 from ..shared.player.vlc_player import VlcPlayerEvents
 from ..shared.player.types import Artist, Album, Track
 from ..shared.player.iplayer import IPlayer
+from .library import LibraryIndex
+from typing import Optional
 import libsonic
+import os
 import random
 import textwrap
-import threading
-import time
 
 class MySubsonicConnection(libsonic.Connection):
 
@@ -47,11 +48,13 @@ class MySubsonicConnection(libsonic.Connection):
 class SubsonicPlugin(IPlayer):
 
     partition_keys = [ "Latest Albums", "Random Album", "Random Tracks", "A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T", "U", "V", "W", "X-Z", "#" ]
+    LIBRARY_FILE : str = "subsonic_library.db"
     
     def __init__(self, app, config, font) -> None:
         super().__init__(app, config, font)
         # reset everything
         
+        self._library : LibraryIndex = None
         self._state = IPlayer.State.NONE
         self._toggle_state = IPlayer.ToggleState.NONE
         self._info_latch = True
@@ -96,7 +99,7 @@ class SubsonicPlugin(IPlayer):
                             self._log.debug(f"loading albums for : {artist.display_name}")
                             self._render(f"{artist.display_name}\n:- Loading albums...\n")
 
-                            artist.albums = self._get_albums_by_artist(artist)
+                            self._load_albums(artist)
                             self._log.info(f"Loaded {len(artist.albums)} albums")
 
                         size = len(artist.albums)
@@ -120,7 +123,7 @@ class SubsonicPlugin(IPlayer):
                             )
                             self._render(msg)
 
-                            album.tracks = self._get_tracks_by_album(album)
+                            self._load_tracks(album)
                             self._log.info(f"Loaded {len(album.tracks)} tracks")
                         self._track_counter = 0
                         self._show_track()
@@ -151,6 +154,8 @@ class SubsonicPlugin(IPlayer):
                     case IPlayer.ToggleState.CLEAR_CACHE:
                         # we can safely come back to the root partition 
                         self._state = IPlayer.State.PARTITIONS
+                        if self._library is not None:
+                            self._library.clear()
                         self._build_cache()
                         self._artist_counter = 0
                         self._album_counter = 0
@@ -201,7 +206,7 @@ class SubsonicPlugin(IPlayer):
                 year : int = 0
                 if "year" in album:
                     year = int(album["year"])
-                results.append(Album(album["id"], album["name"], album["artist"], year))
+                results.append(Album(album["id"], album["name"], album["artist"], year, album.get("coverArt", "")))
             # sort by display_name, then year
             return sorted(results, key = lambda x: ((x.display_name, x.year)) )
         except Exception as ex:
@@ -209,39 +214,49 @@ class SubsonicPlugin(IPlayer):
             return results
     
     def _get_albums_by_artist(self, artist : Artist) -> list[Album]:
-        self._log.info(f"Loading albums for artist : {artist.display_name}")
-        results: list[Album] = []
+        library : LibraryIndex = self._library
+        results: list[tuple[Album, int]] = []
         try:
+            if library is not None:
+                cached : Optional[list[Album]] = library.albums(artist.id)
+                if cached is not None:
+                    return cached
+            self._log.info(f"Loading albums for artist : {artist.display_name}")
             returned = self._client.getArtist(artist.id)
+            artist_id : str = artist.id
             artist = returned["artist"]
-            if artist["albumCount"] == 0: 
-                return results
-            albums = artist["album"]
+            albums = artist.get("album", []) if artist["albumCount"] > 0 else []
             if albums is None: 
-                return results
+                albums = []
 
             for album in albums:
                 year : int = 0
                 if "year" in album:
                     year = int(album["year"])
-                results.append(Album(album["id"], album["name"], artist["name"], year))
+                results.append((Album(album["id"], album["name"], artist["name"], year, album.get("coverArt", "")), album.get("songCount", 0)))
             # sort by display_name, then year
-            return sorted(results, key = lambda x: ((x.display_name, x.year)) )
+            results = sorted(results, key = lambda x: ((x[0].display_name, x[0].year)) )
+            if library is not None:
+                library.store_albums(artist_id, results)
+            return [ album for album, _ in results ]
         except Exception as ex:
             self._log.error(ex)
-            return results
+            return []
 
     def _get_tracks_by_album(self, album : Album) -> list[Track]:
-        self._log.info(f"Loading tracks for album : '{album.display_name}'")
+        library : LibraryIndex = self._library
         results: list[Track] = []
         try:
+            if library is not None:
+                cached : Optional[list[Track]] = library.tracks(album.id)
+                if cached is not None:
+                    return cached
+            self._log.info(f"Loading tracks for album : '{album.display_name}'")
             returned = self._client.getAlbum(album.id)
-            album = returned["album"]
-            if album["songCount"] == 0: 
-                return results
-            songs = album["song"]
+            found = returned["album"]
+            songs = found.get("song", []) if found["songCount"] > 0 else []
             if songs is None: 
-                return results
+                songs = []
 
             for song in songs:
                 id = song["id"]
@@ -249,16 +264,44 @@ class SubsonicPlugin(IPlayer):
                 index : int = 0
                 if "track" in song:
                     index = int(song["track"])
-                track = Track(id, name, album["name"], album["artist"], index)
+                track = Track(id, name, found["name"], found["artist"], index, cover_id = song.get("coverArt", ""))
                 results.append(track)
                 self._log.debug(f"Added track: {track}")
 
             # sort by track index, then display_name if no index
-            return sorted(results, key = lambda x: ((x.index, x.display_name)) )
+            results = sorted(results, key = lambda x: ((x.index, x.display_name)) )
+            if library is not None:
+                library.store_tracks(album, results)
+            return results
         except Exception as ex:
             self._log.error(ex)
             return results
 
+    def _connect(self) -> None:
+        client : MySubsonicConnection = MySubsonicConnection(
+            self._config["ip"], 
+            self._config["username"], 
+            self._config["password"], 
+            int(self._config["port"]), 
+            apiVersion="1.16.0"
+        )
+        self._log.info(client.getLicense())
+        self._client = client
+
+    def destroy(self) -> None:
+        super().destroy()
+        if self._library is not None:
+            self._library.close()
+            self._library = None
+
+    def warm_up(self) -> None:
+        if not self._config["username"]:
+            return
+        if self._client is None:
+            self._connect()
+        if len(self._artists.items()) == 0:
+            self._build_cache()
+
     def activate(self) -> bool:
         if not super().activate(): 
             return False
@@ -269,16 +312,8 @@ class SubsonicPlugin(IPlayer):
 
             if self._client is None:
                 try:
-                    self._client = MySubsonicConnection(
-                        self._config["ip"], 
-                        self._config["username"], 
-                        self._config["password"], 
-                        int(self._config["port"]), 
-                        apiVersion="1.16.0"
-                    )
-                    self._log.info(self._client.getLicense())
+                    self._connect()
                 except Exception as ex:
-                    self._client = None
                     self._info_callback({
                         "time": 2, 
                         "message": f"Couldn't connect to server\n{ex}", 
@@ -298,11 +333,7 @@ class SubsonicPlugin(IPlayer):
                 self._build_cache()
             self._restore_state()
 
-            if not self._running:
-                self._running = True
-                if self._thread is None:
-                    self._thread = threading.Thread(target = self._run)
-                    self._thread.start()
+            self._start_running()
 
         except Exception as ex:
             self._log.error(ex)
@@ -376,53 +407,82 @@ class SubsonicPlugin(IPlayer):
 
     def _add_latest_albums(self) -> None:
         albums: list[Album] = self._get_albums_by_filter("newest")
-        for album in albums:
-            self._enqueue_album(album)
-        num_albums: int = len(albums)
-        time.sleep(1)
-        self._render(f"Latest albums:\nEnqueued {num_albums} albums...\n")
+        self._enqueue_albums(albums, f"Latest albums:\nEnqueued {len(albums)} albums...\n")
 
     def _add_random_album(self) -> None:
         albums: list[Album] = self._get_albums_by_filter("random")
+        if len(albums) == 0:
+            return
         album: Album = albums[0]
-        self._enqueue_album(album)
-        time.sleep(1)
-        self._render(f"Enqueued album\n{album.display_name}\nby {album.artist_name}")
+        self._enqueue_albums([ album ], f"Enqueued album\n{album.display_name}\nby {album.artist_name}")
 
     def _add_random_tracks(self) -> None:
         albums: list[Album] = self._get_albums_by_filter("random")
-        for album in albums:
-            album.tracks = self._get_tracks_by_album(album)
-            num_tracks: int = len(album.tracks)
-            track: Track = album.tracks[random.randint(0, num_tracks - 1)]
-            self._enqueue(track)
-        num_albums: int = len(albums)
-        time.sleep(1)
-        self._render(f"Random:\nEnqueued {num_albums} tracks...\n")
-
-    def _build_cache(self) -> defaultdict[:list] :
-        partitions = defaultdict(list)
-        partition_keys = SubsonicPlugin.partition_keys.copy()
-        for k in partition_keys:
-            partitions[k] = []
-
+        picked: list[Track] = [ random.choice(tracks) for tracks in self._tracks_for_albums(albums, with_urls = False) if len(tracks) > 0 ]
+        for track in picked:
+            if not track.url:
+                track.url = self._get_stream_for_track(track)
+        self._player.enqueue_tracks(picked, f"Random:\nEnqueued {len(picked)} tracks...\n")
+
+    def _open_library(self) -> Optional[LibraryIndex]:
+        if self._library is None:
+            path : str = os.path.join(self._app.creds_path, self._config.get("library_index", SubsonicPlugin.LIBRARY_FILE))
+            try:
+                self._library = LibraryIndex(path, f"{self._config['ip']}:{self._config['port']}/{self._config['username']}")
+            except Exception as ex:
+                # browsing still works, straight from the server
+                self._log.error(f"Couldn't open the library index {path} : {ex}")
+        return self._library
+
+    def _fetch_artists(self, partition_keys : list[str]) -> list[tuple[str, str, str, int]]:
         self._log.info("Loading artists")
         artists = self._client.getArtists()
         artist_partition_list = artists["artists"]["index"]
-        counter : int = 0
+        results : list[tuple[str, str, str, int]] = []
         for key in partition_keys:
             for artist_partition in artist_partition_list:
                 if artist_partition["name"] == key:
                     artist_list = artist_partition["artist"]
-                    num_found = len(artist_list)
-                    counter += num_found
-                    self._log.info(f"Loaded {num_found} artists for {key}*")
+                    self._log.info(f"Loaded {len(artist_list)} artists for {key}*")
                     for artist in artist_list:
-                        a = Artist(artist["id"], artist["name"])
-                        partitions[key].append(a)
+                        results.append((artist["id"], artist["name"], key, artist.get("albumCount", 0)))
                     continue
 
-        self._log.info(f"Loaded {counter} artists")
+        self._log.info(f"Loaded {len(results)} artists")
+        return results
+
+    def _sync_library(self, library : LibraryIndex, partition_keys : list[str]) -> None:
+        """
+        getIndexes with ifModifiedSince comes back without an index when nothing has changed,
+        only then is the full artist list fetched again.
+        """
+        since : float = library.last_modified
+        try:
+            indexes = self._client.getIndexes(ifModifiedSince = since)["indexes"]
+        except Exception as ex:
+            if since == 0:
+                raise
+            self._log.warning(f"Couldn't check the server for library changes, browsing the local index : {ex}")
+            return
+        last_modified : float = indexes.get("lastModified", 0)
+        if since > 0 and (last_modified == since or "index" not in indexes):
+            self._log.info("Library unchanged since the last sync")
+            return
+        library.replace_artists(self._fetch_artists(partition_keys), last_modified)
+
+    def _build_cache(self) -> defaultdict[:list] :
+        partition_keys = SubsonicPlugin.partition_keys.copy()
+        library : Optional[LibraryIndex] = self._open_library()
+        if library is None:
+            partitions = defaultdict(list)
+            for k in partition_keys:
+                partitions[k] = []
+            for id, name, key, _ in self._fetch_artists(partition_keys):
+                partitions[key].append(Artist(id, name))
+        else:
+            self._sync_library(library, partition_keys)
+            partitions = library.artists(partition_keys)
+            self._log.info(f"Library index : {library.stats}")
 
         self._artists = partitions
         self._partition_keys = partition_keys
@@ -75,6 +75,14 @@ class TadoPlugin(IPlugin):
     def run_as_daemon(self) -> None:
         pass
 
+    def warm_up(self) -> None:
+        if self._tado is not None or not self._config["filepath"]:
+            return
+        tado = interface.Tado(token_file_path=self._config["filepath"])
+        # the device auth flow needs the screen, so that is left to activate
+        if tado.device_activation_status() == DeviceActivationStatus.COMPLETED:
+            self._tado = tado
+
     def on_button_press(self, deck, key, key_state):
         super().on_button_press(deck, key, key_state)
 
@@ -107,7 +115,7 @@ class TadoPlugin(IPlugin):
             case TadoPlugin.State.ZONES:
                 if (dial == 0):
                     self._zone_info = None
-                    self._zone_index += sorted((-1, value, 1))[1]
+                    self._zone_index += value
                     self._zone_index = self._wrap(self._zone_index, len(self._zones))
                     self._show_zones()
             case TadoPlugin.State.ZONE_INFO:
@@ -116,15 +124,12 @@ class TadoPlugin(IPlugin):
                     self.on_dial_turned(deck, dial, value)
                 elif (dial == 1):
                     # temperature
-                    if (value > 0):
-                        self._zone_info["target"] += 0.5
-                    else:
-                        self._zone_info["target"] -= 0.5
+                    self._zone_info["target"] += 0.5 * value
                     self._show_zone_info()
             case TadoPlugin.State.DEVICES:
                 if (dial != 0):
                     return
-                self._device_index += sorted((-1, value, 1))[1]
+                self._device_index += value
                 self._device_index = self._wrap(self._device_index, len(self._devices))
                 self._show_devices()
             case TadoPlugin.State.HOME:
@@ -1,8 +1,6 @@
-import threading
-import time
-
 from enum import auto, IntEnum
 from ..IPlugin import IPlugin
+from services.periodic import PeriodicTask
 from .VacuumDevice import VacuumDevice
 
 class VacuumPlugin(IPlugin):
@@ -33,8 +31,7 @@ class VacuumPlugin(IPlugin):
         self._state : VacuumPlugin.State = VacuumPlugin.State.NONE
         self._images = None
         self._status_counter: int = 0
-        self._thread : thread = None
-        self._running: bool = False
+        self._status_task : PeriodicTask = None
         self._help_message = "Tuya Vacuum plugin\nBack | Clean | Charge"
 
     def activate(self) -> bool:
@@ -57,10 +54,8 @@ class VacuumPlugin(IPlugin):
                     version = self._config["protocol_version"]
                 )
 
-            if self._thread is None:
-                self._running = True
-                self._thread = threading.Thread(target = self._run)
-                self._thread.start()
+            if self._status_task is None:
+                self._status_task = self._app.tasks.every(10.0, self._update_status, f"{self._class}.status", jitter = 0.5)
                     
             self._activated = True
             self._show_default()
@@ -106,10 +101,9 @@ class VacuumPlugin(IPlugin):
 
     def deactivate(self):
         try:
-            self._running = False
-            if self._thread is not None:
-                self._thread.join()
-                self._thread = None
+            if self._status_task is not None:
+                self._status_task.cancel(wait = True)
+                self._status_task = None
         except:
             pass
         super().deactivate()
@@ -164,13 +158,3 @@ class VacuumPlugin(IPlugin):
     def _show_default(self):
         self._update_buttons()
         self._render(self._name)
-
-    ### thread entry point for just lopping thru our status
-    def _run(self) -> None:
-        if not self._activated: return
-    
-        self._log.info(f"{self._class} thread starting")
-        while (self._running):
-            time.sleep(10)
-            self._update_status()
-        self._log.info(f"{self._class} thread exiting")
@@ -1,4 +1,6 @@
 from ..IPlugin import IPlugin
+from services.periodic import PeriodicTask
+from services.timers import TimerHandle
 from .accessory import IAccessory, AccessoryFactory
 from .characteristic import ICharacteristic
 from .shared import *
@@ -8,12 +10,12 @@ from homekit.controller.ip_implementation import IpPairing
 
 import homekit
 import os
-import threading
-import time
 
 class VeluxPlugin(IPlugin):
 
     REFRESH_INTERVAL : int = 60
+    # dial 1 moves a blind or window, one put to the gateway per batch of turns
+    DIAL_FRAME_INTERVALS : dict[int, float] = { 1: 0.3 }
 
     image_keys : list[str] = [ 
         "gateway.png", 
@@ -61,14 +63,13 @@ class VeluxPlugin(IPlugin):
         self._images : list[bytes] = None
         self._state : VeluxPlugin.State = VeluxPlugin.State.NONE
         self._ctrl : homekit.Controller = None
-        self._thread : threading.Thread = None
-        self._thread_counter : int = 0
+        self._poll_task : PeriodicTask = None
         self._sensor_counter : int = 0
         self._zone_counter : int = 0
         self._za_counter : int = 0
         self._shutter_counter : int = 0
         self._window_counter : int = 0
-        self._notify_timer : threading.Timer = None
+        self._notify_timer : TimerHandle = None
         self._help_message = "Velux plugin\nBack | Info | Sensors | Zones\nBlinds | Windows | N/A | N/A"
 
     def activate(self) -> bool:
@@ -82,63 +83,65 @@ class VeluxPlugin(IPlugin):
                 self._load_images(self._images, VeluxPlugin.image_keys)
 
             if len(self._accessories) == 0:
-                try:
-                    if self._ctrl is None:
-                        homekit_file : str = self._config.get("homekit_file", None)
-                        homekit_file_path = os.path.join(self._app.creds_path, homekit_file)
-                        if not os.path.isfile(homekit_file_path):
-                            self._log.error(f"Homekit file not found : {homekit_file_path}")
-                            self._activated = False
-                            return self._activated
-                        self._ctrl = homekit.Controller()
-                        self._ctrl.load_data(homekit_file_path)
-
-                    self._poll_environment()
-                    self._log.info(f"Loaded {len(self._zones)} zones")
-                    self._log.info(f"Loaded {len(self._accessories)} accessories")
-                    self._log.info(f"Loaded {len(self._types)} types")
-                    self._activated = (
-                        len(self._zones) > 0 and 
-                        len(self._accessories) > 0 and 
-                        len(self._types) > 0
-                    )
-                except Exception as ex:
-                    self._log.error(f"Couldn't load accessories : {ex}")
-                    self._activated = False
+                self._activated = self._load_accessories()
 
             if self._activated:
                 self._initialize()
                 self._update_buttons()
                 self._update_screen()
 
-            if self._thread is None:
-                self._thread = threading.Thread(target = self._thread_loop)
-                self._thread.start()
+            if self._poll_task is None:
+                # the gateway times out now and then, retry those after 5 seconds
+                self._poll_task = self._app.tasks.every(
+                    VeluxPlugin.REFRESH_INTERVAL + 1,
+                    self._refresh,
+                    f"{self._class}.refresh",
+                    jitter = 1.0,
+                    retry = 5.0,
+                    max_backoff = VeluxPlugin.REFRESH_INTERVAL
+                )
 
         except Exception as ex:
             self._log.error(ex)
             self._activated = False
         return self._activated
 
-    def _thread_loop(self):
-        if self._thread is None: 
-            return
-        try:
-            counter : int = 0
-            self._log.info("Thread is starting")
-            while (self._activated):
-                counter += 1
-                if counter > VeluxPlugin.REFRESH_INTERVAL:
-                    counter = 0
-                    if not self._poll_environment():
-                        counter = VeluxPlugin.REFRESH_INTERVAL - 5
-                    else:
-                        self._update_screen()
-                time.sleep(1)
+    def warm_up(self) -> None:
+        if len(self._accessories) == 0:
+            self._load_accessories()
 
+    def _load_accessories(self) -> bool:
+        try:
+            if self._ctrl is None:
+                homekit_file : str = self._config.get("homekit_file", None)
+                homekit_file_path = os.path.join(self._app.creds_path, homekit_file)
+                if not os.path.isfile(homekit_file_path):
+                    self._log.error(f"Homekit file not found : {homekit_file_path}")
+                    return False
+                ctrl : homekit.Controller = homekit.Controller()
+                ctrl.load_data(homekit_file_path)
+                self._ctrl = ctrl
+
+            self._poll_environment()
+            self._log.info(f"Loaded {len(self._zones)} zones")
+            self._log.info(f"Loaded {len(self._accessories)} accessories")
+            self._log.info(f"Loaded {len(self._types)} types")
+            return (
+                len(self._zones) > 0 and 
+                len(self._accessories) > 0 and 
+                len(self._types) > 0
+            )
         except Exception as ex:
-            self._log.error("Thread exception : {ex}")
-        self._log.info("Thread exiting")
+            self._log.error(f"Couldn't load accessories : {ex}")
+            return False
+
+    def _refresh(self) -> bool:
+        if not self._activated:
+            return True
+        if not self._poll_environment():
+            return False
+        self._update_screen()
+        return True
 
     def _poll_environment(self) -> bool:
 
@@ -179,9 +182,9 @@ class VeluxPlugin(IPlugin):
 
     def deactivate(self):
         super().deactivate()
-        if self._thread is not None:
-            self._thread.join()
-            self._thread = None
+        if self._poll_task is not None:
+            self._poll_task.cancel(wait = True)
+            self._poll_task = None
 
     def destroy(self):
         super().destroy()
@@ -198,21 +201,18 @@ class VeluxPlugin(IPlugin):
             case VeluxPlugin.State.SENSOR:
                 if dial != 0: 
                     return
-                value = sorted((-1, value, 1))[1]
                 self._sensor_counter += value
                 self._sensor_counter = self._wrap(self._sensor_counter, len(self._accessories_by_type(VeluxTypes.SENSOR)))
                 self._select_sensor()
             case VeluxPlugin.State.ZONES:
                 if dial != 0: 
                     return
-                value = sorted((-1, value, 1))[1]
                 self._zone_counter += value
                 self._zone_counter = self._wrap(self._zone_counter, len(self._zones))
                 self._select_zone()
             case VeluxPlugin.State.ZONE_ACCESSORY_SELECT:
                 if dial != 0: 
                     return
-                value = sorted((-1, value, 1))[1]
                 self._za_counter += value
                 zone : VeluxZone = self._zones[self._zone_counter]
                 self._za_counter = self._wrap(self._za_counter, len(zone.accessories))
@@ -234,7 +234,6 @@ class VeluxPlugin(IPlugin):
             case VeluxPlugin.State.SHUTTERS:
                 match dial:
                     case 0:
-                        value = sorted((-1, value, 1))[1]
                         self._shutter_counter += value
                         self._shutter_counter = self._wrap(self._shutter_counter, len(self._accessories_by_type(VeluxTypes.EXTERNAL_COVER)))
                         self._select_shutter()
@@ -257,7 +256,6 @@ class VeluxPlugin(IPlugin):
             case VeluxPlugin.State.WINDOWS:
                 match dial:
                     case 0:
-                        value = sorted((-1, value, 1))[1]
                         self._window_counter += value
                         self._window_counter = self._wrap(self._window_counter, len(self._accessories_by_type(VeluxTypes.VELUX_WINDOW)))
                         self._select_window()
@@ -489,8 +487,7 @@ class VeluxPlugin(IPlugin):
         if reset_after:
             if self._notify_timer is not None:
                 self._notify_timer.cancel()
-            self._notify_timer = threading.Timer(wait, self._update_screen)
-            self._notify_timer.start()
+            self._notify_timer = self._app.timers.call_later(wait, self._update_screen)
 
     def _update_buttons(self):
         # layout the images
@@ -0,0 +1,7 @@
+from .compositor import Compositor, Frame, Region
+from .fonts import FontCache, get_font, font_cache
+from .frame_cache import FrameCache
+from .icon_bundle import IconBundle, encode_icon
+from .image_store import ImageStore
+from .key_writer import KeyWriter
+from .text_fit import FitResult, fit_font_size, MIN_FONT_SIZE
@@ -0,0 +1,127 @@
+from services.startup_profile import startup_profiler
+from typing import Callable, NamedTuple, Optional, Tuple, Union
+
+import logging
+import os
+import threading
+
+FrameSource = Union[bytes, Callable[[], bytes]]
+Region = Tuple[int, int, int, int]
+
+class Frame(NamedTuple):
+    image : FrameSource
+    x : int
+    y : int
+    width : int
+    height : int
+    guard : Optional[Callable[[], bool]]
+
+    @property
+    def region(self) -> Region:
+        return (self.x, self.y, self.width, self.height)
+
+class Compositor():
+    """
+    Owns every write to the touchscreen.
+    Producers submit frames into a mailbox with one slot per screen region and return straight away,
+    the compositor thread always shows the newest frame for a region and frames it never got to are dropped.
+    A full screen frame supersedes any pending region frames, a region frame submitted after it is
+    shown on top of it.
+    A frame can be passed as a callable, so the rasterising and encoding happens on the
+    compositor thread, and only for frames which actually make it to the screen.
+    A guard is checked just before showing, so a frame whose owner has gone away is not shown.
+    """
+
+    def __init__(self, app, deck_lock : threading.Lock) -> None:
+        self._app = app
+        self._deck_lock : threading.Lock = deck_lock
+        # insertion ordered, so regions are shown in the order they were first submitted
+        self._pending : dict[Region, Frame] = {}
+        self._condition : threading.Condition = threading.Condition()
+        self._thread : threading.Thread = None
+        self._running : bool = False
+        self._frames_submitted : int = 0
+        self._frames_shown : int = 0
+        self._frames_dropped : int = 0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "submitted": self._frames_submitted,
+            "shown": self._frames_shown,
+            "dropped": self._frames_dropped
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target = self._run, name = "compositor", daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def submit(self, image : FrameSource, x : int = 0, y : int = 0, width : int = -1, height : int = -1, guard : Optional[Callable[[], bool]] = None) -> None:
+        if width < 0:
+            width = self._app.screen_width - x
+        if height < 0:
+            height = self._app.screen_height - y
+        frame : Frame = Frame(image, x, y, width, height, guard)
+        with self._condition:
+            if self._covers_screen(frame):
+                self._frames_dropped += len(self._pending)
+                self._pending.clear()
+            elif frame.region in self._pending:
+                self._frames_dropped += 1
+            self._pending[frame.region] = frame
+            self._frames_submitted += 1
+            self._condition.notify()
+
+    def _covers_screen(self, frame : Frame) -> bool:
+        return frame.x <= 0 and frame.y <= 0 \
+            and frame.x + frame.width >= self._app.screen_width \
+            and frame.y + frame.height >= self._app.screen_height
+
+    def _run(self) -> None:
+        self._log.debug("Compositor thread starting")
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                region : Region = next(iter(self._pending))
+                frame : Frame = self._pending.pop(region)
+            self._show(frame)
+        self._log.debug("Compositor thread exiting")
+
+    def _show(self, frame : Frame) -> None:
+        try:
+            if frame.guard is not None and not frame.guard():
+                self._frames_dropped += 1
+                return
+            image : bytes = frame.image() if callable(frame.image) else frame.image
+            if not image:
+                return
+            deck = self._app.deck
+            if deck is None:
+                return
+            # rendering takes a while, check we are still wanted before taking the deck
+            if frame.guard is not None and not frame.guard():
+                self._frames_dropped += 1
+                return
+            with self._deck_lock:
+                deck.set_touchscreen_image(image, frame.x, frame.y, frame.width, frame.height)
+            self._frames_shown += 1
+            startup_profiler().mark("first_touchscreen_frame")
+        except Exception as ex:
+            self._log.error(f"Error showing frame : {ex}")
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from PIL import ImageFont
+from PIL.ImageFont import FreeTypeFont
+from typing import Tuple
+
+import logging
+import os
+import threading
+
+class FontCache():
+    """
+    Size keyed cache of loaded truetype fonts.
+    Parsing a font face from disk is expensive, so each (path, size) pair is loaded once
+    and kept until it becomes the least recently used entry of a full cache.
+    """
+
+    MAX_ENTRIES : int = 64
+
+    def __init__(self, max_entries : int = MAX_ENTRIES) -> None:
+        self._max_entries : int = max(1, max_entries)
+        self._fonts : OrderedDict[Tuple[str, float], FreeTypeFont] = OrderedDict()
+        self._lock : threading.Lock = threading.Lock()
+        self._hits : int = 0
+        self._misses : int = 0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        return len(self._fonts)
+
+    def get(self, font_path : str, font_size : float) -> FreeTypeFont:
+        key : Tuple[str, float] = (str(font_path), font_size)
+        with self._lock:
+            font : FreeTypeFont = self._fonts.get(key, None)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self._hits += 1
+                return font
+
+        # load outside the lock, a duplicate load on a race is harmless
+        font = ImageFont.truetype(key[0], font_size)
+        with self._lock:
+            self._misses += 1
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self._max_entries:
+                evicted, _ = self._fonts.popitem(last = False)
+                self._log.debug(f"Evicted font {evicted[0]} @ {evicted[1]}")
+        return font
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fonts.clear()
+
+_font_cache : FontCache = FontCache()
+
+def get_font(font_path : str, font_size : float) -> FreeTypeFont:
+    """
+    Returns the shared, process wide instance of the font at the given size.
+    """
+    return _font_cache.get(font_path, font_size)
+
+def font_cache() -> FontCache:
+    return _font_cache
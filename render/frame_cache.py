@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import logging
+import os
+import threading
+
+FrameKey = Tuple[str, float, str, str, int, int]
+
+class FrameCache():
+    """
+    LRU cache of encoded touchscreen frames, keyed by text, style and screen size.
+    Entries are evicted least recently used first once the held bytes exceed the budget.
+    """
+
+    DEFAULT_MAX_BYTES : int = 2 * 1024 * 1024
+
+    def __init__(self, max_bytes : int = DEFAULT_MAX_BYTES) -> None:
+        self._max_bytes : int = max(0, max_bytes)
+        self._frames : OrderedDict[FrameKey, bytes] = OrderedDict()
+        self._bytes : int = 0
+        self._hits : int = 0
+        self._misses : int = 0
+        self._font_signature : tuple = None
+        self._lock : threading.Lock = threading.Lock()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @staticmethod
+    def key(text : str, font_size : float, font_path : str, bg_color : str, width : int, height : int) -> FrameKey:
+        return (text, font_size, str(font_path), bg_color, width, height)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def held_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "entries": len(self._frames),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes
+        }
+
+    def get(self, key : FrameKey) -> Optional[bytes]:
+        with self._lock:
+            frame : bytes = self._frames.get(key, None)
+            if frame is None:
+                self._misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self._hits += 1
+            return frame
+
+    def put(self, key : FrameKey, frame : bytes) -> None:
+        size : int = len(frame)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            old : bytes = self._frames.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._frames[key] = frame
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, evicted = self._frames.popitem(last = False)
+                self._bytes -= len(evicted)
+
+    def get_or_render(self, key : FrameKey, render : Callable[[], bytes]) -> bytes:
+        frame : bytes = self.get(key)
+        if frame is None:
+            frame = render()
+            if frame:
+                self.put(key, frame)
+        return frame
+
+    def set_font(self, font : dict) -> None:
+        """
+        Drops every cached frame when the font config differs from the one the frames were rendered with.
+        """
+        signature : tuple = tuple(sorted((k, str(v)) for k, v in font.items()))
+        if signature != self._font_signature:
+            if self._font_signature is not None:
+                self._log.info("Font config changed, invalidating frame cache")
+            self._font_signature = signature
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
@@ -0,0 +1,192 @@
+"""
+Pre-encoded key icons, packed into one indexed file which is mmap'd at startup.
+
+    python -m render.icon_bundle [bundle_path]
+
+File layout is the magic, a little endian uint32 index length, the json index, then the JPEG blobs.
+The index maps "<path relative to the repo>@<icon size>" to [offset, length, source mtime_ns].
+"""
+from pathlib import Path
+from PIL import Image
+from typing import Iterable, Optional, Union
+
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+
+MAGIC : bytes = b"SDIB1"
+KEY_SIZE : int = 120
+ICON_SIZES : list[int] = [ 100 ]
+IMAGE_SUFFIXES : tuple[str, ...] = ( ".png", ".gif" )
+ROOT : Path = Path(__file__).resolve().parent.parent
+
+_log : logging.Logger = logging.getLogger(__name__)
+_log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+def encode_icon(path : Union[str, Path], size : int = 100, key_size : int = KEY_SIZE) -> bytes:
+    """
+    Centres the icon, resized to size, on a black key sized square and encodes it as JPEG.
+    """
+    img = Image.new('RGB', (key_size, key_size), color='black')
+    icon = Image.open(path).resize((size, size)).convert("RGBA")
+    border = int((key_size - size) / 2)
+    img.paste(icon, (border, border), icon)
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format = 'JPEG')
+    return img_byte_arr.getvalue()
+
+def bundle_key(path : Union[str, Path], size : int) -> str:
+    resolved : Path = Path(path).resolve()
+    try:
+        name : str = resolved.relative_to(ROOT).as_posix()
+    except ValueError:
+        name = resolved.as_posix()
+    return f"{name}@{size}"
+
+def find_icons(root : Path = ROOT) -> list[Path]:
+    icons : list[Path] = []
+    for folder in [ root / "images" ] + sorted((root / "plugins").glob("**/images")):
+        if not folder.is_dir():
+            continue
+        icons.extend(sorted(p for p in folder.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES))
+    return icons
+
+class IconBundle():
+    """
+    Serves pre-encoded key icons as zero copy memoryviews over the mmap'd bundle.
+    An icon whose source file has changed since the bundle was built is treated as missing,
+    so the caller falls back to encoding it live.
+    """
+
+    DEFAULT_PATH : str = "icons.bundle"
+
+    def __init__(self, path : Union[str, Path] = DEFAULT_PATH) -> None:
+        self._path : Path = Path(path)
+        self._file = None
+        self._mmap : Optional[mmap.mmap] = None
+        self._view : Optional[memoryview] = None
+        self._index : dict[str, list[int]] = {}
+        self._data_start : int = 0
+        self._hits : int = 0
+        self._misses : int = 0
+        self._stale : int = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._view is not None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._index),
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale
+        }
+
+    def open(self) -> bool:
+        if self.loaded:
+            return True
+        if not self._path.is_file():
+            _log.info(f"No icon bundle at {self._path}, icons will be encoded live")
+            return False
+        try:
+            self._file = open(self._path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            header_size : int = len(MAGIC) + 4
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError("not an icon bundle")
+            index_length : int = struct.unpack("<I", self._mmap[len(MAGIC):header_size])[0]
+            self._index = json.loads(self._mmap[header_size:header_size + index_length])
+            self._data_start = header_size + index_length
+            self._view = memoryview(self._mmap)
+            _log.info(f"Mapped icon bundle {self._path} with {len(self._index)} icons")
+            return True
+        except Exception as ex:
+            _log.error(f"Failed to map icon bundle {self._path} : {ex}")
+            self._index = {}
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            return False
+
+    def get(self, path : Union[str, Path], size : int) -> Optional[memoryview]:
+        if not self.loaded:
+            return None
+        entry : list[int] = self._index.get(bundle_key(path, size), None)
+        if entry is None:
+            self._misses += 1
+            return None
+        offset, length, mtime_ns = entry
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                self._stale += 1
+                return None
+        except OSError:
+            self._misses += 1
+            return None
+        self._hits += 1
+        start : int = self._data_start + offset
+        return self._view[start:start + length]
+
+def is_current(bundle_path : Union[str, Path], icons : Iterable[Path], sizes : Iterable[int] = ICON_SIZES) -> bool:
+    bundle : IconBundle = IconBundle(bundle_path)
+    if not bundle.open():
+        return False
+    for icon in icons:
+        for size in sizes:
+            if bundle.get(icon, size) is None:
+                return False
+    return True
+
+def build(bundle_path : Union[str, Path] = IconBundle.DEFAULT_PATH, icons : Optional[list[Path]] = None, sizes : Iterable[int] = ICON_SIZES) -> int:
+    """
+    Encodes every icon at every size into a new bundle, swapped in atomically so a running app keeps its mapping.
+    Returns the number of icons written.
+    """
+    if icons is None:
+        icons = find_icons()
+    index : dict[str, list[int]] = {}
+    blobs : list[bytes] = []
+    offset : int = 0
+    for icon in icons:
+        for size in sizes:
+            try:
+                blob : bytes = encode_icon(icon, size)
+            except Exception as ex:
+                _log.error(f"Skipping '{icon}' : {ex}")
+                continue
+            index[bundle_key(icon, size)] = [ offset, len(blob), os.stat(icon).st_mtime_ns ]
+            blobs.append(blob)
+            offset += len(blob)
+
+    index_bytes : bytes = json.dumps(index, separators = (",", ":")).encode()
+    tmp_path : str = f"{bundle_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, bundle_path)
+    return len(index)
+
+def main() -> None:
+    logging.basicConfig(level = os.environ.get("LOGLEVEL", "INFO"))
+    bundle_path : str = sys.argv[1] if len(sys.argv) > 1 else IconBundle.DEFAULT_PATH
+    icons : list[Path] = find_icons()
+    if is_current(bundle_path, icons):
+        _log.info(f"Icon bundle {bundle_path} is up to date")
+        return
+    count : int = build(bundle_path, icons)
+    _log.info(f"Wrote {count} icons to {bundle_path}")
+
+if __name__ == "__main__":
+    main()
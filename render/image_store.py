@@ -0,0 +1,87 @@
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+import hashlib
+import logging
+import os
+import threading
+
+ImageKey = Tuple[str, int]
+
+class ImageStore():
+    """
+    App wide store of encoded key images, keyed by the source file's content hash and the target size.
+    Plugins shipping identical icons under different paths (blank.png, back.png, play.png...) all get
+    a reference to the one encoded copy.
+    """
+
+    def __init__(self) -> None:
+        self._images : dict[ImageKey, bytes] = {}
+        # path -> (mtime_ns, digest), so a file is only hashed again when it changes
+        self._digests : dict[str, Tuple[int, str]] = {}
+        self._bytes : int = 0
+        self._requests : int = 0
+        self._shared : int = 0
+        self._bytes_saved : int = 0
+        self._lock : threading.Lock = threading.Lock()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def held_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._images),
+            "requests": self._requests,
+            "shared": self._shared,
+            "bytes": self._bytes,
+            "bytes_saved": self._bytes_saved
+        }
+
+    def get(self, path : Union[str, Path], size : int, load : Callable[[], bytes]) -> Optional[bytes]:
+        """
+        Returns the shared image for the file's content at this size, calling load only the first time it is seen.
+        """
+        key : ImageKey = (self._digest(path), size)
+        with self._lock:
+            self._requests += 1
+            image : bytes = self._images.get(key, None)
+            if image is not None:
+                self._shared += 1
+                self._bytes_saved += len(image)
+                return image
+
+        image = load()
+        if image is None:
+            return None
+
+        with self._lock:
+            # another thread may have loaded it while we were, keep the first
+            existing : bytes = self._images.get(key, None)
+            if existing is not None:
+                return existing
+            self._images[key] = image
+            self._bytes += len(image)
+        return image
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._digests.clear()
+            self._bytes = 0
+
+    def _digest(self, path : Union[str, Path]) -> str:
+        name : str = str(path)
+        mtime_ns : int = os.stat(name).st_mtime_ns
+        with self._lock:
+            cached : Tuple[int, str] = self._digests.get(name, None)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+        with open(name, "rb") as f:
+            digest : str = hashlib.sha1(f.read()).hexdigest()
+        with self._lock:
+            self._digests[name] = (mtime_ns, digest)
+        return digest
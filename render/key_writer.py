@@ -0,0 +1,157 @@
+from services.startup_profile import startup_profiler
+from typing import Optional
+
+import logging
+import os
+import threading
+import time
+
+_UNKNOWN_IMAGE : object = object()
+
+class KeyWriter():
+    """
+    Owns every write to the keys.
+    Callers submit a full or partial layout as a dict of key to image and return straight away.
+    Updates arriving within the frame window are coalesced, so a key set twice is only written once,
+    and the whole batch is flushed in one pass under the deck lock.
+    Keys already showing an identical image are skipped.
+    """
+
+    DEFAULT_FRAME_WINDOW : float = 0.005
+
+    def __init__(self, app, deck_lock : threading.Lock, frame_window : float = DEFAULT_FRAME_WINDOW) -> None:
+        self._app = app
+        self._deck_lock : threading.Lock = deck_lock
+        self._frame_window : float = max(0.0, frame_window)
+        self._pending : dict[int, Optional[bytes]] = {}
+        self._pending_since : float = 0.0
+        self._in_flight : bool = False
+        # what each key is currently showing, so we never re-send an identical image
+        self._key_images : dict[int, object] = {}
+        self._condition : threading.Condition = threading.Condition()
+        self._thread : threading.Thread = None
+        self._running : bool = False
+        self._writes : int = 0
+        self._writes_saved : int = 0
+        self._coalesced : int = 0
+        self._flushes : int = 0
+        self._last_flush_latency : float = 0.0
+        self._max_flush_latency : float = 0.0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def writes(self) -> int:
+        return self._writes
+
+    @property
+    def writes_saved(self) -> int:
+        return self._writes_saved
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "writes": self._writes,
+            "saved": self._writes_saved,
+            "coalesced": self._coalesced,
+            "flushes": self._flushes,
+            "last_flush_latency_ms": round(self._last_flush_latency * 1000, 2),
+            "max_flush_latency_ms": round(self._max_flush_latency * 1000, 2)
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target = self._run, name = "key-writer", daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def reset(self) -> None:
+        """
+        Forgets what the keys are showing, call it after the deck has been reset.
+        """
+        with self._condition:
+            self._key_images.clear()
+
+    def submit(self, images : dict[int, Optional[bytes]]) -> None:
+        if not images:
+            return
+        with self._condition:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            for key, image in images.items():
+                if key in self._pending:
+                    self._coalesced += 1
+                self._pending[key] = image
+            self._condition.notify()
+
+    def flush(self, timeout : float = 1.0) -> bool:
+        """
+        Blocks until everything submitted so far has been written, or the timeout passes.
+        """
+        deadline : float = time.monotonic() + timeout
+        with self._condition:
+            while (self._pending or self._in_flight) and self._running:
+                remaining : float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        self._log.debug("Key writer thread starting")
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    break
+            # let the rest of the layout arrive, so it goes out as one burst
+            if self._frame_window > 0:
+                time.sleep(self._frame_window)
+            with self._condition:
+                batch : dict[int, Optional[bytes]] = self._pending
+                since : float = self._pending_since
+                self._pending = {}
+                self._in_flight = True
+            self._write(batch, since)
+            with self._condition:
+                self._in_flight = False
+                self._condition.notify_all()
+        self._log.debug("Key writer thread exiting")
+
+    def _write(self, batch : dict[int, Optional[bytes]], since : float) -> None:
+        deck = self._app.deck
+        if deck is None:
+            return
+        written : int = 0
+        with self._deck_lock:
+            for key, image in sorted(batch.items()):
+                current : object = self._key_images.get(key, _UNKNOWN_IMAGE)
+                if current is image or (current is not _UNKNOWN_IMAGE and current == image):
+                    self._writes_saved += 1
+                    continue
+                try:
+                    # forget it first, so a failed write is retried next time
+                    self._key_images.pop(key, None)
+                    deck.set_key_image(key, image)
+                    self._key_images[key] = image
+                    written += 1
+                except Exception as ex:
+                    self._log.error(f"Error writing key {key} : {ex}")
+        self._writes += written
+        if written > 0:
+            startup_profiler().mark("first_keys")
+        self._flushes += 1
+        self._last_flush_latency = time.monotonic() - since
+        self._max_flush_latency = max(self._max_flush_latency, self._last_flush_latency)
+        self._log.debug(f"Flushed {written} of {len(batch)} keys in {self._last_flush_latency * 1000:.1f}ms")
@@ -0,0 +1,56 @@
+from PIL.ImageFont import FreeTypeFont
+from typing import NamedTuple
+from .fonts import get_font
+
+MIN_FONT_SIZE : int = 10
+
+class FitResult(NamedTuple):
+    size : int
+    font : FreeTypeFont
+    iterations : int
+
+def fit_font_size(text : str, font_path : str, font_size : int, max_width : float, min_size : int = MIN_FONT_SIZE) -> FitResult:
+    """
+    Finds the largest font size, no bigger than font_size, at which text fits into max_width.
+    The common case of the text already fitting costs a single measurement. Otherwise the
+    advance width is assumed to scale linearly with size to get an estimate, the estimate is
+    bracketed, and whatever range is left is bisected.
+    If nothing fits, min_size is returned.
+    """
+    font_size = int(font_size)
+    font : FreeTypeFont = get_font(font_path, font_size)
+    width : float = font.getlength(text)
+    iterations : int = 1
+    if font_size <= min_size or width <= max_width:
+        return FitResult(font_size, font, iterations)
+
+    # invariant: hi never fits, lo fits (or is the floor)
+    lo : int = min_size
+    hi : int = font_size
+    best : FreeTypeFont = None
+
+    def probe(size : int) -> bool:
+        nonlocal lo, hi, best, iterations
+        iterations += 1
+        candidate : FreeTypeFont = get_font(font_path, size)
+        if candidate.getlength(text) <= max_width:
+            lo = size
+            best = candidate
+            return True
+        hi = size
+        return False
+
+    estimate : int = min(max(int(font_size * max_width / width), lo + 1), hi - 1)
+    if estimate > lo:
+        if probe(estimate):
+            if estimate + 1 < hi:
+                probe(estimate + 1)
+        elif estimate - 1 > lo:
+            probe(estimate - 1)
+
+    while hi - lo > 1:
+        probe((lo + hi) // 2)
+
+    if best is None:
+        best = get_font(font_path, lo)
+    return FitResult(lo, best, iterations)
@@ -18,6 +18,9 @@ if [[ ${result} -ne 0 ]]; then
     exit ${result}
 fi
 
+logger "Refreshing the icon bundle..."
+python -m render.icon_bundle 2>> ${LOGFILE}
+
 while : ; do
     if ! /bin/pgrep -f "${MAIN}" &> /dev/null; then
         logger "Launching the app..." 
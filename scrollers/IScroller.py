@@ -1,13 +1,9 @@
-from . import clock as clock_scroller
-from . import cmd as cmd_scroller
-from . import date as date_scroller
-from . import stocks as stocks_scroller
-from . import text as text_scroller
-from . import weather as weather_scroller
 from abc import ABC, abstractmethod
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from PIL.ImageFont import FreeTypeFont
+from render.text_fit import fit_font_size
+from services.registry import ModuleRegistry
 from typing import Tuple
 
 import io
@@ -66,6 +62,13 @@ class IScroller(ABC):
     def name(self) -> str:
         return self._name
 
+    @property
+    def uses_network(self) -> bool:
+        """
+        Whether generate fetches from the network, those are paused when the app is asleep.
+        """
+        return False
+
     @property
     def _plugin_path(self) -> str:
         dirname = Path(__file__).resolve().parent
@@ -89,12 +92,9 @@ class IScroller(ABC):
         line_height : int = int((self._app.screen_height - 10) / num_lines)
         line_gap : int = int(20 / num_lines)
 
-        f : FreeTypeFont = ImageFont.truetype(self._font["font_path"], font_size)
-        text_width : int = f.getlength(text[0])
-        while text_width > (self._app.screen_width - self._app.screen_height - 10) and font_size > 10:
-            font_size -= 2
-            f = ImageFont.truetype(self._font["font_path"], font_size)
-            text_width = f.getlength(text[0])
+        f : FreeTypeFont
+        max_width : int = self._app.screen_width - self._app.screen_height - 10
+        font_size, f, _ = fit_font_size(text[0], self._font["font_path"], font_size, max_width)
 
         if num_lines == 1:
             x = (self._app.screen_width - f.getlength(text[0])) / 2
@@ -125,29 +125,26 @@ class IScroller(ABC):
 
 class ScrollerFactory:
 
+    registry : ModuleRegistry = ModuleRegistry("scrollers", {
+        "clock": ("scrollers.clock.clock", "ClockScroller"),
+        "cmd": ("scrollers.cmd.cmd", "CmdScroller"),
+        "date": ("scrollers.date.date", "DateScroller"),
+        "stocks": ("scrollers.stocks.stocks", "StocksScroller"),
+        "text": ("scrollers.text.text", "TextScroller"),
+        "weather": ("scrollers.weather.weather", "WeatherScroller")
+    })
+
     @staticmethod
     def create_scroller(app, config, font) -> IScroller:
-
-        match config["class"]:
-            case "clock":
-                return clock_scroller.clock.ClockScroller(app, config, font)
-            case "cmd":
-                return cmd_scroller.cmd.CmdScroller(app, config, font)
-            case "date":
-                return date_scroller.date.DateScroller(app, config, font)
-            case "stocks":
-                return stocks_scroller.stocks.StocksScroller(app, config, font)
-            case "text":
-                return text_scroller.text.TextScroller(app, config, font)
-            case "weather":
-                return weather_scroller.weather.WeatherScroller(app, config, font)
-            case _:
-                return text_scroller.text.TextScroller(app, {
-                        "name": "my-greeeting", 
-                        "class": "text",
-                        "config": {
-                            "text": "Unhandled scroller\nClass: " + config["class"]
-                        }
-                    }, 
-                    font
-                )
+        scroller_class = ScrollerFactory.registry.resolve(config["class"])
+        if scroller_class is None:
+            return ScrollerFactory.registry.resolve("text")(app, {
+                    "name": "my-greeeting", 
+                    "class": "text",
+                    "config": {
+                        "text": "Unhandled scroller\nClass: " + config["class"]
+                    }
+                }, 
+                font
+            )
+        return scroller_class(app, config, font)
@@ -1,8 +1 @@
 #from plugins import IPlugin
-
-from scrollers.clock.clock import ClockScroller
-from scrollers.cmd.cmd import CmdScroller
-from scrollers.date.date import DateScroller
-from scrollers.stocks.stocks import StocksScroller
-from scrollers.text.text import TextScroller
-from scrollers.weather.weather import WeatherScroller
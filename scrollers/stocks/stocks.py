@@ -17,6 +17,10 @@ class StocksScroller(IScroller):
         self._pages: list[str] = []
         self._page_counter: int = 0
 
+    @property
+    def uses_network(self) -> bool:
+        return True
+
     def generate(self) -> bytes:
 
         self._page_counter = 0
@@ -27,6 +27,10 @@ class WeatherScroller(IScroller):
         self._pages: list[str] = []
         self._page_counter: int = 0
 
+    @property
+    def uses_network(self) -> bool:
+        return True
+
     def generate(self) -> bytes:
         """
         Generates weather information based on the user's configuration.
@@ -0,0 +1,8 @@
+from .action_queue import ActionQueue
+from .dial_aggregator import DialAggregator
+from .idle import IdlePolicy, IdleTier
+from .periodic import PeriodicTask, TaskPool
+from .registry import ModuleRegistry
+from .scheduler import Job, Scheduler
+from .startup_profile import StartupProfiler, startup_profiler
+from .timers import TimerHandle, TimerService
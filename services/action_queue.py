@@ -0,0 +1,87 @@
+from collections import deque
+from typing import Callable
+
+import logging
+import os
+import threading
+import time
+
+class ActionQueue():
+    """
+    Runs callbacks one at a time, in the order they were submitted, on a thread of its own.
+    The thread only exists while there is something queued, so an idle queue costs nothing.
+    Keeps the queue depth, how long callbacks waited to start and how long they took.
+    """
+
+    def __init__(self, name : str) -> None:
+        self._name : str = name
+        self._queue : deque[tuple[float, Callable, tuple]] = deque()
+        self._lock : threading.Lock = threading.Lock()
+        self._thread : threading.Thread = None
+        self._max_depth : int = 0
+        self._handled : int = 0
+        self._failed : int = 0
+        self._dropped : int = 0
+        self._total_wait : float = 0.0
+        self._max_wait : float = 0.0
+        self._total_run : float = 0.0
+        self._max_run : float = 0.0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def stats(self) -> dict:
+        handled : int = max(1, self._handled)
+        return {
+            "depth": len(self._queue),
+            "max_depth": self._max_depth,
+            "handled": self._handled,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "mean_wait_ms": round(self._total_wait / handled * 1000, 2),
+            "max_wait_ms": round(self._max_wait * 1000, 2),
+            "mean_run_ms": round(self._total_run / handled * 1000, 2),
+            "max_run_ms": round(self._max_run * 1000, 2)
+        }
+
+    def submit(self, callback : Callable, *args) -> None:
+        with self._lock:
+            self._queue.append((time.monotonic(), callback, args))
+            self._max_depth = max(self._max_depth, len(self._queue))
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = self._name, daemon = True)
+                self._thread.start()
+
+    def clear(self) -> None:
+        """
+        Drops anything not yet started, the callback running now, if any, carries on.
+        """
+        with self._lock:
+            self._dropped += len(self._queue)
+            self._queue.clear()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._thread = None
+                    return
+                queued, callback, args = self._queue.popleft()
+            start : float = time.monotonic()
+            try:
+                callback(*args)
+            except Exception:
+                self._failed += 1
+                self._log.exception(f"Error in {self._name} handling {getattr(callback, '__name__', 'callback')}")
+            finished : float = time.monotonic()
+            wait : float = start - queued
+            run : float = finished - start
+            self._handled += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._total_run += run
+            self._max_run = max(self._max_run, run)
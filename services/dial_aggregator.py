@@ -0,0 +1,104 @@
+from typing import Optional
+
+import math
+import threading
+import time
+
+from .timers import TimerService
+
+class _DialState():
+
+    def __init__(self) -> None:
+        self.pending : int = 0
+        self.scheduled : bool = False
+        self.last_flush : float = 0.0
+
+class DialAggregator():
+    """
+    Sums the active plugin's dial turns, and hands each dial's total to the plugin at most once a frame,
+    so a fast spin costs a render per frame instead of one per detent.
+    Plugins can ask for a longer frame on a dial with DIAL_FRAME_INTERVALS, when each step is a network call.
+    On the dials a plugin lists in ACCELERATED_DIALS the step grows with the speed of the spin,
+    up to max_multiplier times once it passes threshold detents a second, for getting through long lists.
+    """
+
+    DEFAULT_FRAME_INTERVAL : float = 1 / 30
+    DEFAULT_THRESHOLD : float = 15.0
+    DEFAULT_MAX_MULTIPLIER : float = 8.0
+
+    def __init__(self, timers : TimerService, frame_interval : float = DEFAULT_FRAME_INTERVAL,
+            threshold : float = DEFAULT_THRESHOLD, max_multiplier : float = DEFAULT_MAX_MULTIPLIER) -> None:
+        self._timers : TimerService = timers
+        self._frame_interval : float = max(0.0, frame_interval)
+        self._threshold : float = max(1.0, threshold)
+        self._max_multiplier : float = max(1.0, max_multiplier)
+        self._states : dict[tuple[object, int], _DialState] = {}
+        self._lock : threading.Lock = threading.Lock()
+        self._turns : int = 0
+        self._flushes : int = 0
+        self._accelerated : int = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "turns": self._turns,
+            "flushes": self._flushes,
+            "accelerated": self._accelerated
+        }
+
+    def turn(self, plugin, deck, dial : int, value : int) -> None:
+        """
+        Called from the deck's reader thread, returns straight away.
+        """
+        with self._lock:
+            self._turns += 1
+            state : _DialState = self._states.setdefault((plugin, dial), _DialState())
+            state.pending += value
+            if state.scheduled:
+                return
+            state.scheduled = True
+            wait : float = state.last_flush + self._interval(plugin, dial) - time.monotonic()
+        if wait > 0:
+            self._timers.call_later(wait, lambda: self._dispatch(plugin, deck, dial))
+        else:
+            self._dispatch(plugin, deck, dial)
+
+    def clear(self, plugin) -> None:
+        """
+        Forgets the plugin's pending turns, for when it deactivates.
+        """
+        with self._lock:
+            for key in [ k for k in self._states if k[0] is plugin ]:
+                del self._states[key]
+
+    def _interval(self, plugin, dial : int) -> float:
+        return getattr(plugin, "DIAL_FRAME_INTERVALS", {}).get(dial, self._frame_interval)
+
+    def _dispatch(self, plugin, deck, dial : int) -> None:
+        # behind any presses already queued, the total is taken when it runs so it keeps growing until then
+        plugin.input_queue.submit(self._flush, plugin, deck, dial)
+
+    def _flush(self, plugin, deck, dial : int) -> None:
+        with self._lock:
+            state : Optional[_DialState] = self._states.get((plugin, dial))
+            if state is None:
+                return
+            value : int = state.pending
+            now : float = time.monotonic()
+            elapsed : float = now - state.last_flush
+            state.pending = 0
+            state.scheduled = False
+            state.last_flush = now
+            if value == 0:
+                return
+            self._flushes += 1
+            if dial in getattr(plugin, "ACCELERATED_DIALS", ()):
+                value = self._accelerate(value, max(elapsed, self._interval(plugin, dial)))
+        plugin.on_dial_turned(deck, dial, value)
+
+    def _accelerate(self, value : int, elapsed : float) -> int:
+        speed : float = abs(value) / elapsed
+        multiplier : float = min(self._max_multiplier, max(1.0, speed / self._threshold))
+        if multiplier > 1.0:
+            self._accelerated += 1
+        return int(math.copysign(round(abs(value) * multiplier), value))
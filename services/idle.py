@@ -0,0 +1,64 @@
+from enum import auto, IntEnum
+from typing import Optional
+
+class IdleTier(IntEnum):
+    ACTIVE = 0
+    # scrollers page more slowly
+    QUIET = auto()
+    # scrollers slower still and network backed ones paused, plugin polling stretched
+    ASLEEP = auto()
+
+class IdlePolicy():
+    """
+    How far the app throttles itself after a stretch without any key or dial input.
+    Read from the "idle_tiers" config section, any input puts it straight back to ACTIVE.
+    """
+
+    DEFAULT_QUIET_AFTER : float = 300.0
+    DEFAULT_ASLEEP_AFTER : float = 1800.0
+
+    def __init__(self, config : dict) -> None:
+        self._enabled : bool = config.get("enabled", True)
+        self._quiet_after : float = config.get("quiet_after_s", IdlePolicy.DEFAULT_QUIET_AFTER)
+        self._asleep_after : float = max(self._quiet_after, config.get("asleep_after_s", IdlePolicy.DEFAULT_ASLEEP_AFTER))
+        self._scroll_stretch : dict[IdleTier, float] = {
+            IdleTier.ACTIVE: 1.0,
+            IdleTier.QUIET: max(1.0, config.get("quiet_scroll_stretch", 4.0)),
+            IdleTier.ASLEEP: max(1.0, config.get("asleep_scroll_stretch", 20.0))
+        }
+        self._poll_stretch : dict[IdleTier, float] = {
+            IdleTier.ACTIVE: 1.0,
+            IdleTier.QUIET: 1.0,
+            IdleTier.ASLEEP: max(1.0, config.get("asleep_poll_stretch", 4.0))
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def tier_for(self, idle_for : float) -> IdleTier:
+        if not self._enabled or idle_for < self._quiet_after:
+            return IdleTier.ACTIVE
+        if idle_for < self._asleep_after:
+            return IdleTier.QUIET
+        return IdleTier.ASLEEP
+
+    def next_change(self, idle_for : float) -> Optional[float]:
+        """
+        Seconds until the next tier down, or None when there isn't one.
+        """
+        if not self._enabled:
+            return None
+        for threshold in (self._quiet_after, self._asleep_after):
+            if idle_for < threshold:
+                return threshold - idle_for
+        return None
+
+    def scroll_stretch(self, tier : IdleTier) -> float:
+        return self._scroll_stretch[tier]
+
+    def poll_stretch(self, tier : IdleTier) -> float:
+        return self._poll_stretch[tier]
+
+    def pauses_network(self, tier : IdleTier) -> bool:
+        return tier >= IdleTier.ASLEEP
@@ -0,0 +1,215 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import logging
+import os
+import random
+import threading
+import time
+
+from .scheduler import Job, Scheduler
+
+class PeriodicTask():
+    """
+    A callback run every interval seconds on the task pool, never overlapping itself.
+    The next run is timed from the end of the last one, plus or minus up to jitter seconds.
+    When the callback raises, or returns False, it is retried after retry seconds, growing by backoff
+    on every consecutive failure up to max_backoff.
+    """
+
+    def __init__(self, pool : "TaskPool", callback : Callable[[], Optional[bool]], name : str, interval : float,
+            jitter : float, retry : float, backoff : float, max_backoff : float) -> None:
+        self._pool : TaskPool = pool
+        self._callback : Callable[[], Optional[bool]] = callback
+        self._name : str = name
+        self._interval : float = interval
+        self._jitter : float = jitter
+        self._retry : float = retry
+        self._backoff : float = backoff
+        self._max_backoff : float = max_backoff
+        self._job : Job = Job(pool._scheduler, self._submit, name)
+        self._cancelled : bool = False
+        self._running : bool = False
+        self._running_thread : Optional[threading.Thread] = None
+        self._next_delay : Optional[float] = None
+        self._idle : threading.Event = threading.Event()
+        self._idle.set()
+        self._failures : int = 0
+        self._runs : int = 0
+        self._last_duration : float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def active(self) -> bool:
+        return not self._cancelled
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "runs": self._runs,
+            "failures": self._failures,
+            "last_duration_ms": round(self._last_duration * 1000, 2)
+        }
+
+    def trigger(self) -> None:
+        """
+        Runs it as soon as possible, instead of waiting for the interval.
+        """
+        self.reschedule(0)
+
+    def postpone(self) -> None:
+        """
+        Pushes the next run back a whole interval, for when something else just did the work.
+        """
+        self.reschedule(self._interval)
+
+    def reschedule(self, delay : float) -> None:
+        if self._cancelled:
+            return
+        with self._pool._lock:
+            if self._running:
+                # picked up when the current run finishes
+                self._next_delay = delay
+                return
+        self._job.reschedule(delay)
+
+    def cancel(self, wait : bool = False) -> None:
+        """
+        Stops any further runs, with wait it also blocks until a run in progress has finished.
+        """
+        self._cancelled = True
+        self._job.cancel()
+        if wait and self._running_thread is not threading.current_thread():
+            self._idle.wait()
+
+    def _snap_back(self, stretch : float) -> None:
+        """
+        Brings a run pushed out by a longer stretch back within the interval.
+        """
+        deadline : Optional[float] = self._job.deadline
+        if self._cancelled or self._running or deadline is None:
+            return
+        remaining : float = deadline - time.monotonic()
+        if remaining > self._interval * stretch:
+            self.reschedule(self._interval * stretch)
+
+    def _submit(self) -> None:
+        if self._cancelled:
+            return
+        with self._pool._lock:
+            self._running = True
+            self._next_delay = None
+            self._idle.clear()
+        try:
+            self._pool._executor.submit(self._run)
+        except RuntimeError:
+            # the pool is shutting down
+            with self._pool._lock:
+                self._running = False
+            self._idle.set()
+
+    def _run(self) -> None:
+        self._running_thread = threading.current_thread()
+        start : float = time.monotonic()
+        succeeded : bool = True
+        try:
+            succeeded = self._callback() is not False
+        except Exception as ex:
+            self._pool._log.error(f"Task {self._name} failed : {ex}")
+            succeeded = False
+        self._last_duration = time.monotonic() - start
+        self._runs += 1
+
+        if succeeded:
+            self._failures = 0
+            delay : float = self._interval * self._pool._stretch
+        else:
+            self._failures += 1
+            delay = min(self._max_backoff, self._retry * (self._backoff ** (self._failures - 1)))
+        if self._jitter > 0:
+            delay = max(0.0, delay + random.uniform(-self._jitter, self._jitter))
+
+        with self._pool._lock:
+            self._running = False
+            self._running_thread = None
+            if self._next_delay is not None:
+                delay = self._next_delay
+                self._next_delay = None
+        if not self._cancelled:
+            self._job.reschedule(delay)
+        self._idle.set()
+
+class TaskPool():
+    """
+    Runs the plugins' periodic work on a small bounded pool of threads, instead of a sleeping thread each.
+    One scheduler thread keeps the deadlines, the workers only exist while there is something to run.
+    """
+
+    DEFAULT_MAX_WORKERS : int = 4
+
+    def __init__(self, max_workers : int = DEFAULT_MAX_WORKERS) -> None:
+        self._max_workers : int = max(1, max_workers)
+        self._scheduler : Scheduler = Scheduler("periodic", daemon = True)
+        self._executor : ThreadPoolExecutor = ThreadPoolExecutor(max_workers = self._max_workers, thread_name_prefix = "periodic")
+        self._tasks : list[PeriodicTask] = []
+        self._lock : threading.Lock = threading.Lock()
+        self._stretch : float = 1.0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            self._tasks = [ t for t in self._tasks if t.active ]
+            tasks : list[PeriodicTask] = list(self._tasks)
+        return {
+            "max_workers": self._max_workers,
+            "stretch": self._stretch,
+            "tasks": { t.name: t.stats for t in tasks },
+            "scheduler": self._scheduler.stats
+        }
+
+    def start(self) -> None:
+        self._scheduler.start()
+
+    def stop(self) -> None:
+        self._scheduler.stop()
+        self._executor.shutdown(wait = False, cancel_futures = True)
+
+    def set_stretch(self, stretch : float) -> None:
+        """
+        Multiplies every task's interval, to poll less while nobody is using the deck.
+        Going back down pulls in the runs already scheduled further out than the new interval.
+        """
+        stretch = max(1.0, stretch)
+        with self._lock:
+            shrinking : bool = stretch < self._stretch
+            self._stretch = stretch
+            tasks : list[PeriodicTask] = [ t for t in self._tasks if t.active ]
+        if shrinking:
+            for task in tasks:
+                task._snap_back(stretch)
+
+    def every(self, interval : float, callback : Callable[[], Optional[bool]], name : str = "", jitter : float = 0.0,
+            initial_delay : Optional[float] = None, retry : Optional[float] = None, backoff : float = 2.0,
+            max_backoff : Optional[float] = None) -> PeriodicTask:
+        """
+        Runs callback every interval seconds, first after initial_delay, which defaults to the interval.
+        """
+        task : PeriodicTask = PeriodicTask(
+            self,
+            callback,
+            name or getattr(callback, "__qualname__", "task"),
+            interval,
+            jitter,
+            interval if retry is None else retry,
+            backoff,
+            interval * 8 if max_backoff is None else max_backoff
+        )
+        with self._lock:
+            self._tasks.append(task)
+        task.reschedule(interval if initial_delay is None else initial_delay)
+        return task
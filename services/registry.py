@@ -0,0 +1,65 @@
+from typing import Optional
+
+import importlib
+import logging
+import os
+import threading
+import time
+
+class ModuleRegistry():
+    """
+    Maps a config class name to the module and class implementing it, importing the module the first time it is asked for.
+    Only what config.json actually uses gets imported, along with whatever heavy libraries it pulls in.
+    How long each import took is kept, the first module to import a shared library is the one charged for it.
+    """
+
+    def __init__(self, name : str, entries : dict[str, tuple[str, str]]) -> None:
+        self._name : str = name
+        self._entries : dict[str, tuple[str, str]] = entries
+        self._classes : dict[str, type] = {}
+        self._import_times : dict[str, float] = {}
+        self._lock : threading.Lock = threading.Lock()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._entries.keys())
+
+    @property
+    def loaded(self) -> list[str]:
+        return list(self._classes.keys())
+
+    @property
+    def stats(self) -> dict:
+        """
+        Import time in ms per module, in the order they were loaded.
+        """
+        return { module: round(seconds * 1000, 2) for module, seconds in self._import_times.items() }
+
+    def resolve(self, name : str) -> Optional[type]:
+        """
+        The class registered for name, or None when nothing is.
+        """
+        entry : Optional[tuple[str, str]] = self._entries.get(name)
+        if entry is None:
+            return None
+        with self._lock:
+            cls : Optional[type] = self._classes.get(name)
+            if cls is None:
+                module_name, class_name = entry
+                start : float = time.perf_counter()
+                module = importlib.import_module(module_name)
+                self._import_times[module_name] = time.perf_counter() - start
+                cls = getattr(module, class_name)
+                self._classes[name] = cls
+                self._log.debug(f"Loaded {self._name} {name} from {module_name} in {self._import_times[module_name] * 1000:.1f}ms")
+            return cls
+
+    def report(self) -> None:
+        if len(self._import_times) == 0:
+            return
+        total : float = sum(self._import_times.values()) * 1000
+        self._log.info(f"Imported {len(self._import_times)} of {len(self._entries)} {self._name} in {total:.1f}ms")
+        for module_name, seconds in sorted(self._import_times.items(), key = lambda item: item[1], reverse = True):
+            self._log.info(f"  {module_name} : {seconds * 1000:.1f}ms")
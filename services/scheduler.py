@@ -0,0 +1,134 @@
+from typing import Callable, Optional
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+class Job():
+    """
+    A callback due at a deadline on the scheduler thread.
+    Rescheduling or cancelling only bumps the version, stale heap entries are skipped when they come up.
+    """
+
+    def __init__(self, scheduler : "Scheduler", callback : Callable[[], None], name : str) -> None:
+        self._scheduler : Scheduler = scheduler
+        self._callback : Callable[[], None] = callback
+        self._name : str = name
+        self._deadline : Optional[float] = None
+        self._version : int = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
+    @property
+    def active(self) -> bool:
+        return self._deadline is not None
+
+    def reschedule(self, delay : float) -> "Job":
+        """
+        Moves the job to delay seconds from now, whether it was pending, cancelled or has already run.
+        """
+        self._scheduler._push(self, time.monotonic() + max(0.0, delay))
+        return self
+
+    def cancel(self) -> None:
+        self._scheduler._cancel(self)
+
+class Scheduler():
+    """
+    Runs jobs at their deadlines on one thread, sleeping until the earliest one instead of polling.
+    Jobs run one at a time, so keep them short and hand anything slow off to another thread.
+    """
+
+    def __init__(self, name : str = "scheduler", daemon : bool = False) -> None:
+        self._name : str = name
+        self._daemon : bool = daemon
+        self._heap : list[tuple[float, int, int, Job]] = []
+        self._sequence = itertools.count()
+        self._condition : threading.Condition = threading.Condition()
+        self._thread : threading.Thread = None
+        self._running : bool = False
+        self._wakeups : int = 0
+        self._jobs_run : int = 0
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def stats(self) -> dict:
+        with self._condition:
+            pending : int = sum(1 for _, _, version, job in self._heap if version == job._version)
+        return {
+            "wakeups": self._wakeups,
+            "jobs_run": self._jobs_run,
+            "pending": pending
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target = self._run, name = self._name, daemon = self._daemon)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def schedule(self, callback : Callable[[], None], delay : float, name : str = "") -> Job:
+        job : Job = Job(self, callback, name or getattr(callback, "__name__", "job"))
+        return job.reschedule(delay)
+
+    def _push(self, job : Job, deadline : float) -> None:
+        with self._condition:
+            job._version += 1
+            job._deadline = deadline
+            heapq.heappush(self._heap, (deadline, next(self._sequence), job._version, job))
+            # only wake the thread when this is the new earliest deadline
+            if self._heap[0][3] is job:
+                self._condition.notify()
+
+    def _cancel(self, job : Job) -> None:
+        with self._condition:
+            job._version += 1
+            job._deadline = None
+
+    def _run(self) -> None:
+        self._log.info(f"{self._name} thread starting")
+        while True:
+            job : Optional[Job] = None
+            with self._condition:
+                while self._running:
+                    # drop cancelled and rescheduled entries
+                    while self._heap and self._heap[0][2] != self._heap[0][3]._version:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                    else:
+                        delay : float = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            _, _, _, job = heapq.heappop(self._heap)
+                            job._deadline = None
+                            break
+                        self._condition.wait(delay)
+                    self._wakeups += 1
+                if not self._running:
+                    break
+            try:
+                job._callback()
+            except Exception as ex:
+                self._log.critical(f"Job {job.name} failed : {ex}")
+            self._jobs_run += 1
+        self._log.info(f"{self._name} thread exiting")
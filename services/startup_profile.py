@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+import json
+import logging
+import os
+import threading
+import time
+
+class StartupProfiler():
+    """
+    Wall time of each startup phase, and of the moments that matter such as the first frame on screen,
+    measured from when this module was imported, which the launcher does before anything else.
+    Switched off it records nothing, so the phases and marks can stay in place for normal runs.
+    """
+
+    DEFAULT_PATH : str = "startup_profile.json"
+
+    def __init__(self) -> None:
+        self._origin : float = time.perf_counter()
+        self._started : datetime = datetime.now()
+        self._enabled : bool = False
+        self._path : str = self.DEFAULT_PATH
+        self._phases : list[dict] = []
+        self._marks : dict[str, float] = {}
+        self._depth : int = 0
+        self._condition : threading.Condition = threading.Condition()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def enable(self, path : Optional[str] = None) -> None:
+        self._enabled = True
+        if path:
+            self._path = path
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    @contextmanager
+    def phase(self, name : str) -> Iterator[None]:
+        """
+        Times the body of the with block. Phases started inside it are nested under it in the report.
+        """
+        if not self._enabled:
+            yield
+            return
+        entry : dict = { "name": name, "depth": self._depth, "start_ms": round(self._now(), 2), "duration_ms": None }
+        with self._condition:
+            self._phases.append(entry)
+        self._depth += 1
+        start : float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    def mark(self, name : str, at : Optional[float] = None) -> None:
+        """
+        Records when something first happened, or happened at the perf_counter time at.
+        Later calls with the same name are ignored.
+        """
+        if not self._enabled or name in self._marks:
+            return
+        with self._condition:
+            if name not in self._marks:
+                self._marks[name] = round(((at if at is not None else time.perf_counter()) - self._origin) * 1000, 2)
+                self._condition.notify_all()
+
+    def wait_for(self, names : list[str], timeout : float) -> bool:
+        """
+        Blocks until all the marks have been recorded, returning False if that took longer than timeout seconds.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: all(n in self._marks for n in names), timeout)
+
+    def report(self, extra : Optional[dict] = None) -> dict:
+        with self._condition:
+            result : dict = {
+                "started": self._started.isoformat(timespec = "seconds"),
+                "elapsed_ms": round(self._now(), 2),
+                "phases": [ dict(p) for p in self._phases ],
+                "marks": dict(self._marks)
+            }
+        if extra:
+            result.update(extra)
+        return result
+
+    def write(self, extra : Optional[dict] = None) -> None:
+        if not self._enabled:
+            return
+        report : dict = self.report(extra)
+        try:
+            with open(self._path, "w") as f:
+                json.dump(report, f, indent = 2)
+            self._log.info(f"Wrote startup profile to {self._path}")
+        except OSError as ex:
+            self._log.error(f"Couldn't write startup profile to {self._path} : {ex}")
+
+_startup_profiler : StartupProfiler = StartupProfiler()
+
+def startup_profiler() -> StartupProfiler:
+    """
+    The process wide profiler, shared by the launcher and the app.
+    """
+    return _startup_profiler
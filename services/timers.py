@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import logging
+import os
+import threading
+
+from .scheduler import Job, Scheduler
+
+class TimerHandle():
+    """
+    A pending call_later, cancel it to stop the callback running. Cancelling after it has run does nothing.
+    """
+
+    def __init__(self, service : "TimerService", callback : Callable[[], None]) -> None:
+        self._service : TimerService = service
+        self._callback : Callable[[], None] = callback
+        self._job : Job = None
+        self._live : bool = True
+
+    @property
+    def active(self) -> bool:
+        return self._live
+
+    def cancel(self) -> None:
+        if self._service._retire(self, fired = False):
+            self._job.cancel()
+
+    def _fire(self) -> None:
+        if self._service._retire(self, fired = True):
+            self._service._run(self._callback)
+
+class TimerService():
+    """
+    One thread keeps every transient timer in the app, instead of a threading.Timer each.
+    It only does the timing, callbacks run on a few workers, so a restore that talks to a slow device
+    doesn't hold up the others, or the long press help.
+    """
+
+    DEFAULT_WORKERS : int = 4
+
+    def __init__(self, max_workers : int = DEFAULT_WORKERS) -> None:
+        self._scheduler : Scheduler = Scheduler("timers", daemon = True)
+        self._workers : ThreadPoolExecutor = ThreadPoolExecutor(max_workers = max(1, max_workers), thread_name_prefix = "timer")
+        self._live : int = 0
+        self._fired : int = 0
+        self._cancelled : int = 0
+        self._failed : int = 0
+        self._lock : threading.Lock = threading.Lock()
+        self._log : logging.Logger = logging.getLogger(__name__)
+        self._log.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+
+    @property
+    def live_timers(self) -> int:
+        return self._live
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "live": self._live,
+            "fired": self._fired,
+            "cancelled": self._cancelled,
+            "failed": self._failed
+        }
+
+    def start(self) -> None:
+        self._scheduler.start()
+
+    def stop(self) -> None:
+        self._scheduler.stop()
+        self._workers.shutdown(wait = False, cancel_futures = True)
+        with self._lock:
+            self._live = 0
+
+    def call_later(self, delay : float, callback : Callable[[], None]) -> TimerHandle:
+        handle : TimerHandle = TimerHandle(self, callback)
+        with self._lock:
+            self._live += 1
+        handle._job = self._scheduler.schedule(handle._fire, delay, getattr(callback, "__name__", "timer"))
+        return handle
+
+    def _run(self, callback : Callable[[], None]) -> None:
+        try:
+            self._workers.submit(self._call, callback)
+        except RuntimeError:
+            # stopped
+            pass
+
+    def _call(self, callback : Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as ex:
+            self._failed += 1
+            self._log.error(f"Timer {getattr(callback, '__name__', 'callback')} failed : {ex}")
+
+    def _retire(self, handle : TimerHandle, fired : bool) -> bool:
+        """
+        Marks the handle done, returning False when it already was, so a timer cancelled as it fires only counts once.
+        """
+        with self._lock:
+            if not handle._live:
+                return False
+            handle._live = False
+            self._live -= 1
+            if fired:
+                self._fired += 1
+            else:
+                self._cancelled += 1
+            return True
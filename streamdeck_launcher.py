@@ -8,11 +8,16 @@ import time
 import traceback
 import tracemalloc
 
+# first, so the startup profile's clock includes importing everything else
+from services.startup_profile import StartupProfiler, startup_profiler
+
 from app import App
+from devices import VirtualStreamDeckPlus
 from dotenv import load_dotenv
 from envsubst import envsubst
 from StreamDeck.DeviceManager import DeviceManager, StreamDeckPlus
 
+imported_at : float = time.perf_counter()
 profiling : bool = False
 
 def signal_handler(sig, frame):
@@ -26,11 +31,15 @@ def signal_handler(sig, frame):
         sys.exit(0)
 
 def read_config(path : str = "config.json") -> dict:
+    profiler : StartupProfiler = startup_profiler()
     try:
-        with open(path, "r") as f:
-            log.info(f"Reading config from {path}")
-            confstr = f.read()
+        with profiler.phase("config.read"):
+            with open(path, "r") as f:
+                log.info(f"Reading config from {path}")
+                confstr = f.read()
+        with profiler.phase("config.envsubst"):
             confstr = envsubst(confstr)
+        with profiler.phase("config.parse"):
             return json.loads(confstr)
     except:
         log.info(f"Couldn't load config from {path}, using a default config.")
@@ -65,8 +74,23 @@ if __name__ == "__main__":
     logging.basicConfig(level = log_level)
     log = logging.getLogger()
 
-    if len(sys.argv) > 1:
-        config = read_config(sys.argv[1])
+    # --virtual runs against a recording fake deck, for headless runs and benchmarks
+    virtual : bool = "--virtual" in sys.argv
+
+    # --profile-startup[=path] or STARTUP_PROFILE=path writes a json report of the startup phases
+    profile_path : str = os.environ.get("STARTUP_PROFILE", "")
+    if profile_path.lower() in ("1", "true", "yes"):
+        profile_path = StartupProfiler.DEFAULT_PATH
+    for a in sys.argv[1:]:
+        if a == "--profile-startup" or a.startswith("--profile-startup="):
+            profile_path = a.partition("=")[2] or StartupProfiler.DEFAULT_PATH
+    profiler : StartupProfiler = startup_profiler()
+    if profile_path:
+        profiler.enable(profile_path)
+        profiler.mark("imported", imported_at)
+    args : list[str] = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) > 0:
+        config = read_config(args[0])
     else:
         config = read_config()
 
@@ -92,7 +116,8 @@ if __name__ == "__main__":
 
         deck : StreamDeckPlus = None
         while deck is None:
-            streamdecks = DeviceManager().enumerate()
+            with profiler.phase("deck.enumerate"):
+                streamdecks = [ VirtualStreamDeckPlus() ] if virtual else DeviceManager().enumerate()
             log.info(f"Found {len(streamdecks)} Stream Deck(s)")
 
             for i, d in enumerate(streamdecks):
@@ -110,8 +135,14 @@ if __name__ == "__main__":
                 time.sleep(5)
             else:
                 try:
-                    app = App(deck, config)
-                    app.run()
+                    with profiler.phase("app.create"):
+                        app = App(deck, config)
+                    with profiler.phase("app.run"):
+                        app.run()
+                    if profiler.enabled:
+                        if not profiler.wait_for(App.FIRST_FRAME_MARKS, 30):
+                            log.warning("Nothing reached the deck within 30s of startup")
+                        profiler.write({ "imports": app.stats["imports"] })
                     # Wait until all application threads have terminated (for this example,
                     # this is when all deck handles are closed).
                     for t in threading.enumerate():